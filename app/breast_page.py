@@ -0,0 +1,480 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import streamlit as st
+import plotly.graph_objects as go
+import numpy as np
+
+from predictors import (BREAST_ARTIFACT_PATH, INTERVAL_LEVEL, SWEEP_POINTS, breast_sensitivity,
+                        cached_breast_prediction, get_breast_stats as get_feature_stats, get_case_index,
+                        get_fused_model, predict_breast)
+from instrumentation import timed
+from model_registry import REGISTRY
+from predictor_registry import PREDICTORS, mark_used, operating_threshold
+
+# Committed predictions are always recorded, one JSON object per line, to the
+# file named by PREDICTION_LOG or else to stderr.
+prediction_logger = logging.getLogger("cancer_predictor.predictions")
+if not prediction_logger.handlers:
+    _handler = (logging.FileHandler(os.environ["PREDICTION_LOG"]) if os.environ.get("PREDICTION_LOG")
+                else logging.StreamHandler(sys.stderr))
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    prediction_logger.addHandler(_handler)
+    prediction_logger.setLevel(logging.INFO)
+    prediction_logger.propagate = False
+
+SPEC = PREDICTORS["Breast Cancer"]
+SLIDER_LABELS = [(spec["label"], spec["name"]) for spec in SPEC["inputs"]]
+
+# The radar and sensitivity figures are built once per process rather than
+# per session. A rerun swaps its values in and must hold this lock until
+# st.plotly_chart has serialised the figure.
+FIGURE_LOCK = threading.Lock()
+
+
+def add_sidebar(batched=False):
+    st.sidebar.header("Cell Nuclei Measurements")
+    stats = get_feature_stats()
+    index = {key: i for i, key in enumerate(stats["features"])}
+
+    # In batched mode the sliders sit in a form, so moving them costs nothing
+    # until the changes are submitted together.
+    container = st.sidebar.form("slider_form") if batched else st.sidebar
+
+    input_dict = {}
+
+    for spec in SPEC["inputs"]:
+        i = index[spec["name"]]
+        input_dict[spec["name"]] = container.slider(
+            spec["label"],
+            min_value=float(stats["min"][i] if spec["min"] is None else spec["min"]),
+            max_value=float(stats["max"][i] if spec["max"] is None else spec["max"]),
+            value=float(stats["mean"][i])
+        )
+    if batched:
+        container.form_submit_button("Update prediction")
+    return input_dict
+
+
+@timed("scaling")
+def get_scaled_values(input_dict):
+    stats = get_feature_stats()
+    features = stats["features"]
+
+    scaled = cached_breast_prediction([input_dict[key] for key in features])["scaled"]
+
+    return dict(zip(features, scaled.tolist()))
+
+
+RADAR_CATEGORIES = ['Radius', 'Texture', 'Perimeter', 'Area',
+                    'Smoothness', 'Compactness',
+                    'Concavity', 'Concave Points',
+                    'Symmetry', 'Fractal Dimension']
+RADAR_FEATURES = ['radius', 'texture', 'perimeter', 'area', 'smoothness', 'compactness', 'concavity',
+                  'concave points', 'symmetry', 'fractal_dimension']
+RADAR_GROUPS = [('mean', 'Mean Value'), ('se', 'Standard Error'), ('worst', 'Worst Value')]
+
+
+@st.cache_resource
+def get_radar_template():
+    # Built once per process. The plotly template is dropped because the
+    # Streamlit theme replaces it in the browser anyway, and it made up most
+    # of the figure JSON sent on every rerun.
+    fig = go.Figure()
+    for _, name in RADAR_GROUPS:
+        fig.add_trace(go.Scatterpolar(r=[0] * len(RADAR_CATEGORIES), theta=RADAR_CATEGORIES, fill='toself',
+                                      name=name))
+    fig.update_layout(
+        template="none",
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )),
+        showlegend=True,
+        height=600,
+        width=800
+    )
+
+    index = {key: i for i, key in enumerate(get_feature_stats()["features"])}
+    groups = np.array([[index[f"{feature}_{group}"] for feature in RADAR_FEATURES] for group, _ in RADAR_GROUPS])
+    return fig.to_dict(), groups
+
+
+@st.cache_resource
+def get_radar_figure():
+    template, _ = get_radar_template()
+    return go.Figure(template)
+
+
+@timed("chart")
+def get_radar_chart(input_data):
+    _, groups = get_radar_template()
+    scaled = np.fromiter(get_scaled_values(input_data).values(), dtype=float)
+    r = scaled[groups].round(4)
+
+    fig = get_radar_figure()
+    with fig.batch_update():
+        for trace, values in zip(fig.data, r):
+            trace.r = values
+    return fig
+
+
+@st.cache_resource
+def get_contribution_figure():
+    fig = go.Figure(go.Bar(orientation="h", hovertemplate="%{y}: %{x:+.3f} log-odds<extra></extra>"))
+    fig.update_layout(
+        template="none",
+        xaxis=dict(title="Contribution to the log-odds of malignancy", zeroline=True),
+        yaxis=dict(autorange="reversed"),
+        height=700,
+        margin=dict(l=180, t=30),
+    )
+    return fig
+
+
+@timed("contribution_chart")
+def get_contribution_chart(input_data):
+    features = get_feature_stats()["features"]
+    prediction = cached_breast_prediction([input_data[key] for key in features])
+    contribution = prediction["contributions"]
+    labels = dict((key, label) for label, key in SLIDER_LABELS)
+    order = np.argsort(-np.abs(contribution), kind="stable")
+
+    fig = get_contribution_figure()
+    with fig.batch_update():
+        bar = fig.data[0]
+        bar.x = contribution[order]
+        bar.y = [labels[features[i]] for i in order]
+        bar.marker.color = np.where(contribution[order] > 0, "#880808", "#0096FF")
+    return fig, prediction["base_log_odds"], prediction["base_log_odds"] + contribution.sum()
+
+
+@st.cache_resource
+def get_sensitivity_figure():
+    features = get_feature_stats()["features"]
+    labels = dict((key, label) for label, key in SLIDER_LABELS)
+
+    fig = go.Figure(go.Heatmap(
+        z=np.zeros((len(features), SWEEP_POINTS)),
+        x=np.linspace(0, 100, SWEEP_POINTS),
+        y=[labels[key] for key in features],
+        zmin=0,
+        zmax=1,
+        colorscale="RdBu_r",
+        colorbar=dict(title="P(malignant)"),
+        hovertemplate="%{y} = %{customdata:.4g}<br>P(malignant) %{z:.3f}<extra></extra>",
+    ))
+    fig.update_layout(
+        template="none",
+        xaxis=dict(title="Position in observed range (%)"),
+        yaxis=dict(autorange="reversed"),
+        height=700,
+        margin=dict(l=180, t=30),
+    )
+    return fig
+
+
+@timed("sensitivity_chart")
+def get_sensitivity_chart(input_data):
+    features = get_feature_stats()["features"]
+    sweeps = breast_sensitivity([input_data[key] for key in features])
+
+    fig = get_sensitivity_figure()
+    with fig.batch_update():
+        fig.data[0].z = sweeps["proba"]
+        fig.data[0].customdata = sweeps["grid"]
+    return fig
+
+
+SIMILAR_CASE_FEATURES = ["radius_mean", "texture_mean", "area_mean", "concave points_mean", "radius_worst"]
+
+
+@timed("similar_cases")
+def add_similar_cases(input_data, k=5):
+    # Imported here, as the case index is built, so that scipy is only loaded
+    # once a session opens the Similar cases tab.
+    from neighbours import nearest_cases
+
+    features = get_feature_stats()["features"]
+    index = get_case_index()
+    rows, distance, diagnosis = nearest_cases(index, [input_data[key] for key in features], k)
+
+    labels = dict((key, label) for label, key in SLIDER_LABELS)
+    columns = [features.index(key) for key in SIMILAR_CASE_FEATURES]
+    values = index["X"][rows][:, columns]
+    st.caption("The most similar historical cases in data.csv, by distance in the model's scaled feature space")
+    st.dataframe(
+        [
+            {"case": int(row) + 1, "diagnosis": "Malignant" if label else "Benign", "distance": round(float(d), 3),
+             **{labels[key]: round(float(v), 4) for key, v in zip(SIMILAR_CASE_FEATURES, case)}}
+            for row, d, label, case in zip(rows, distance, diagnosis, values)
+        ],
+        hide_index=True,
+    )
+
+
+def add_predictions(input_data):
+    features = get_feature_stats()["features"]
+    prediction = cached_breast_prediction([input_data[key] for key in features])
+    proba = prediction["proba"]
+    threshold = operating_threshold(st.session_state, "Breast Cancer")
+    st.subheader("Cell cluster prediction is:")
+    if threshold != SPEC["threshold"]:
+        st.caption(f"Malignant above a probability of {threshold:.2f}, as set on the Model Evaluation page")
+    if proba[1] <= threshold:
+        st.markdown("""
+                    <style>
+                       .benign {
+                        display: flex;
+                        flex-direction: column;
+                        align-items: center;
+                        justify-content: center;
+                        margin: auto;
+                        padding: 10px;
+                        background-color: #0096FF;
+                        border: 1px solid #ddd;
+                        border-radius: 5px;
+                        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+                        margin: 10px,
+                        # text-align: center;  /* Optional: Align text within the container */
+}
+
+                    </style>
+                """, unsafe_allow_html=True)
+
+        st.markdown('<div class="benign">Benign</div>', unsafe_allow_html=True)
+    else:
+        st.markdown("""
+                    <style>
+                        .malignant {
+                            display: flex;
+                            flex-direction: column;
+                            align-items: center;
+                            justify-content: center;
+                            margin: auto;
+                            padding: 10px;
+                            background-color: #880808;
+                            border: 1px solid #ddd;
+                            border-radius: 5px;
+                            box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+                            text-align: center;  /* Optional: Align text within the container */
+                        }
+
+                    </style>
+                """, unsafe_allow_html=True)
+
+        st.markdown('<div class="malignant">Malignant</div>', unsafe_allow_html=True)
+    st.write("Probability of being benign: ")
+    st.markdown("""
+                        <style>
+                            .probabilities {
+                                display: flex;
+                                flex-direction: column;
+                                align-items: center;
+                                justify-content: center;
+                                margin: auto;
+                                padding: 10px;
+                                border: 1px solid #ddd;
+                                border-radius: 5px;
+                                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+                                text-align: center;  /* Optional: Align text within the container */
+                            }
+
+                        </style>
+                    """, unsafe_allow_html=True)
+
+    st.markdown(f'<div class="probabilities">{round(proba[0], 4) * 100}%</div>',
+                unsafe_allow_html=True)
+    st.write("Probability of being malignant: ")
+    st.markdown(f'<div class="probabilities">{round(proba[1], 4) * 100}%</div>',
+                unsafe_allow_html=True)
+    if prediction["interval"] is not None:
+        low, high = prediction["interval"]
+        st.caption(f"{INTERVAL_LEVEL:.0%} bootstrap interval for the probability of being malignant: "
+                   f"{low * 100:.2f}% to {high * 100:.2f}%")
+
+
+def release_batch_output():
+    # The scored file only backs the download button of the run that produced
+    # it, so it is closed, which deletes it, on the session's next rerun of
+    # this page; the session state going away with the session covers the rest.
+    output = st.session_state.pop("batch_output", None)
+    if output is not None:
+        output.close()
+
+
+def read_batch_output(path):
+    # Deferred: the scored file is read only when the download is requested.
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+    return read
+
+
+def batch_predictions():
+    st.title("Batch Breast Cancer Scoring")
+    st.write("Upload a CSV with the same columns as data.csv to score every record at once")
+    release_batch_output()
+
+    uploaded = st.file_uploader("Fine-needle aspirate records", type="csv")
+    if uploaded is None or not st.button("Score records"):
+        return
+
+    from batch_scoring import write_scored_csv
+
+    features = get_feature_stats()["features"]
+    threshold = operating_threshold(st.session_state, "Breast Cancer")
+    if threshold != SPEC["threshold"]:
+        st.caption(f"Malignant above a probability of {threshold:.2f}, as set on the Model Evaluation page")
+
+    progress = st.progress(0.0, text="Scoring records...")
+    # Scoring runs chunk by chunk into a file on disk. Streamlit still holds a
+    # requested download in memory in full, so the largest output served is
+    # bounded by the upload limit (server.maxUploadSize) rather than constant.
+    output = tempfile.NamedTemporaryFile(mode="w+", newline="", prefix="predictions-", suffix=".csv")
+    try:
+        rows = write_scored_csv(uploaded, output, predict_breast, features, threshold=threshold,
+                                progress=lambda done, rows: progress.progress(done, text=f"Scored {rows} records"))
+    except ValueError as e:
+        output.close()
+        progress.empty()
+        st.error(f"Could not score this file: {e}")
+        return
+
+    output.flush()
+    st.session_state["batch_output"] = output
+    progress.progress(1.0, text=f"Scored {rows} records")
+    st.download_button("Download predictions", read_batch_output(output.name), file_name="predictions.csv",
+                       mime="text/csv", on_click="ignore")
+
+
+def get_live_spec():
+    stats = get_feature_stats()
+    fused = get_fused_model()
+    _, groups = get_radar_template()
+    labels = dict((key, label) for label, key in SLIDER_LABELS)
+
+    return {
+        "version": REGISTRY.version(BREAST_ARTIFACT_PATH),
+        "features": stats["features"],
+        "labels": [labels[key] for key in stats["features"]],
+        "min": stats["min"].tolist(),
+        "max": stats["max"].tolist(),
+        "mean": stats["mean"].tolist(),
+        "weights": fused["weights"].tolist(),
+        "bias": fused["bias"],
+        "groups": groups.tolist(),
+        "group_names": [name for _, name in RADAR_GROUPS],
+        "categories": RADAR_CATEGORIES,
+        "threshold": operating_threshold(st.session_state, "Breast Cancer"),
+    }
+
+
+def live_predictions():
+    st.title("Breast Cancer Predictor")
+    st.write("The prediction and chart update in your browser as you move the sliders. "
+             "Use the log button to record a prediction.")
+
+    from live_predictor import live_predictor
+
+    committed = live_predictor(get_live_spec(), key="live_predictor")
+    if committed is None or committed["committed_at"] == st.session_state.get("live_committed_at"):
+        return
+
+    st.session_state["live_committed_at"] = committed["committed_at"]
+    features = get_feature_stats()["features"]
+    proba = predict_breast([[committed["inputs"][key] for key in features]])[0]
+    prediction_logger.info(json.dumps({
+        "ts": time.time(),
+        "model": "breast",
+        "inputs": committed["inputs"],
+        "probability_benign": float(proba[0]),
+        "probability_malignant": float(proba[1]),
+        "client_probability_malignant": committed["probability_malignant"],
+    }))
+    st.success(f"Logged prediction: {round(proba[1], 4) * 100}% probability of being malignant")
+
+
+def breast_cancer():
+    # add_top_navbar()
+
+    st.markdown("""
+           <style>
+               @import url('/home/gachuki/PycharmProjects/BreastCancerStreamlit/assets/style.css');
+           </style>
+       """, unsafe_allow_html=True)
+
+    mode = st.sidebar.radio("Mode", ["Single patient", "Live (in-browser)", "Batch CSV"])
+    if mode == "Batch CSV":
+        batch_predictions()
+        return
+    if mode == "Live (in-browser)":
+        live_predictions()
+        return
+
+    batched = st.sidebar.toggle("Apply slider changes together")
+
+    with st.container():
+        st.title("Breast Cancer Predictor")
+        st.write(
+            "Please connect this app to your cytology lab to help diagnose breast cancer from cell tissue, You can also update the values using the sliders in the sidebar")
+
+    breast_predictor(batched)
+
+
+def add_radar_chart(input_data):
+    with FIGURE_LOCK:
+        st.plotly_chart(get_radar_chart(input_data))
+
+
+def add_contribution_chart(input_data):
+    with FIGURE_LOCK:
+        fig, base, log_odds = get_contribution_chart(input_data)
+        st.caption(f"Log-odds of malignancy {log_odds:+.3f}, against {base:+.3f} for the average training case. "
+                   f"Each bar is one measurement's exact share of the difference: its scaled value times the "
+                   f"model coefficient; red bars push towards malignant, blue towards benign.")
+        st.plotly_chart(fig)
+
+
+def add_sensitivity_chart(input_data):
+    st.caption("Probability of malignancy as each measurement moves across its observed range "
+               "while the others stay at the sidebar values")
+    with FIGURE_LOCK:
+        st.plotly_chart(get_sensitivity_chart(input_data))
+
+
+VISUALISATIONS = {
+    "radar": ("Radar chart", add_radar_chart),
+    "contributions": ("Feature contributions", add_contribution_chart),
+    "sensitivity": ("What-if sensitivity", add_sensitivity_chart),
+    "similar_cases": ("Similar cases", add_similar_cases),
+}
+
+
+# Changing a slider reruns only this fragment (sliders, the open chart and the
+# prediction), not the cancer type selector or the page setup above it.
+@st.fragment
+@timed("breast_fragment")
+def breast_predictor(batched=False):
+    mark_used("Breast Cancer")
+    input_data = add_sidebar(batched)
+
+    col1, col2 = st.columns([4, 1])
+
+    with col1:
+        # Tracking the selected tab lets a slider move draw only the open
+        # visualisation; switching tabs reruns this fragment to draw the next.
+        tabs = st.tabs([VISUALISATIONS[name][0] for name in SPEC["visualisations"]], key="breast_visualisation",
+                       on_change="rerun")
+        for tab, name in zip(tabs, SPEC["visualisations"]):
+            if tab.open:
+                with tab:
+                    VISUALISATIONS[name][1](input_data)
+    with col2:
+        add_predictions(input_data)
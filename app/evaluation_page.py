@@ -0,0 +1,104 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+from evaluation import best_threshold, operating_point
+from predictors import model_evaluation
+from instrumentation import timed
+from predictor_registry import PREDICTORS, mark_used, operating_threshold, threshold_key
+
+EVALUATED = [name for name, spec in PREDICTORS.items() if spec["evaluation"] is not None]
+
+
+def curve_chart(x, y, xlabel, ylabel, point=None, diagonal=False):
+    fig = go.Figure(go.Scatter(x=x, y=y, mode="lines", name="Model"))
+    if diagonal:
+        fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode="lines", name="Chance",
+                                 line=dict(dash="dash", color="grey")))
+    if point is not None:
+        fig.add_trace(go.Scatter(x=[point[0]], y=[point[1]], mode="markers", name="Operating threshold",
+                                 marker=dict(size=12, symbol="x")))
+    fig.update_layout(
+        template="none",
+        xaxis=dict(title=xlabel, range=[0, 1]),
+        yaxis=dict(title=ylabel, range=[0, 1.02]),
+        height=450,
+        margin=dict(t=30),
+    )
+    return fig
+
+
+def add_threshold_slider(name, curves):
+    # The slider's own state is dropped by Streamlit once this page is left,
+    # so the chosen value is copied to a key the prediction pages read.
+    key = threshold_key(name)
+    widget_key = f"{key} slider"
+    if widget_key not in st.session_state:
+        st.session_state[widget_key] = float(operating_threshold(st.session_state, name))
+    threshold = st.slider("Operating threshold", 0.0, 1.0, step=0.01, key=widget_key,
+                          help="A case is predicted positive when its probability is above this value")
+    st.session_state[key] = threshold
+    suggested = min(max(best_threshold(curves), 0.0), 1.0)
+    st.caption(f"Youden's J (sensitivity + specificity - 1) is highest at a threshold of {suggested:.3f}")
+    return threshold
+
+
+def add_confusion_matrix(point):
+    tp, fp, fn, tn = point["tp"], point["fp"], point["fn"], point["tn"]
+    st.dataframe(
+        [
+            {"": "Actual positive", "Predicted positive": tp, "Predicted negative": fn},
+            {"": "Actual negative", "Predicted positive": fp, "Predicted negative": tn},
+        ],
+        hide_index=True,
+    )
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Sensitivity", f"{tp / max(tp + fn, 1):.3f}")
+    col2.metric("Specificity", f"{tn / max(tn + fp, 1):.3f}")
+    col3.metric("Precision", f"{tp / (tp + fp):.3f}" if tp + fp else "n/a")
+    col4.metric("Accuracy", f"{(tp + tn) / (tp + fp + fn + tn):.3f}")
+
+
+@timed("evaluation_page")
+def evaluation_dashboard():
+    st.title("Model Evaluation")
+    name = st.selectbox("Model", EVALUATED)
+    mark_used(name)
+    result = model_evaluation(PREDICTORS[name]["evaluation"])
+    curves = result["curves"]
+
+    if result["holdout"]:
+        st.caption(f"Scored on the {result['rows']} records held out when the model was trained")
+    else:
+        st.warning(f"This model's artifact does not record which records it was trained on, so it is scored on "
+                   f"all {result['rows']} records, training data included; expect optimistic figures.")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("ROC AUC", f"{result['roc_auc']:.4f}")
+    col2.metric("Average precision", f"{result['average_precision']:.4f}")
+    col3.metric("Brier score", f"{result['brier']:.4f}")
+
+    threshold = add_threshold_slider(name, curves)
+    point = operating_point(curves, threshold)
+    add_confusion_matrix(point)
+
+    tpr = point["tp"] / max(curves["positives"], 1)
+    fpr = point["fp"] / max(curves["negatives"], 1)
+    precision = point["tp"] / (point["tp"] + point["fp"]) if point["tp"] + point["fp"] else 1.0
+    calibration = result["calibration"]
+
+    roc, pr, calibrated = st.tabs(["ROC curve", "Precision-recall", "Calibration"])
+    with roc:
+        st.plotly_chart(curve_chart(curves["fpr"], curves["tpr"], "False positive rate", "True positive rate",
+                                    point=(fpr, tpr), diagonal=True))
+    with pr:
+        st.plotly_chart(curve_chart(curves["tpr"], curves["precision"], "Recall", "Precision",
+                                    point=(tpr, precision)))
+    with calibrated:
+        st.caption("Observed positive rate against mean predicted probability, in ten probability bins")
+        st.plotly_chart(curve_chart(calibration["predicted"], calibration["observed"],
+                                    "Mean predicted probability", "Observed positive rate", diagonal=True))
+        st.dataframe(
+            [{"mean predicted": round(float(p), 3), "observed": round(float(o), 3), "records": int(n)}
+             for p, o, n in zip(calibration["predicted"], calibration["observed"], calibration["count"])],
+            hide_index=True,
+        )
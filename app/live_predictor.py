@@ -0,0 +1,12 @@
+import os
+
+import streamlit.components.v1 as components
+
+COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "live_predictor")
+
+_live_predictor = components.declare_component("live_predictor", path=COMPONENT_DIR)
+
+
+def live_predictor(spec, key=None):
+    # Returns the last prediction the user chose to log, or None.
+    return _live_predictor(spec=spec, key=key, default=None)
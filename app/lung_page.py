@@ -0,0 +1,85 @@
+import streamlit as st
+
+from predictors import cached_lung_prediction, lung_sensitivity
+from instrumentation import timed
+from predictor_registry import PREDICTORS, mark_used, operating_threshold
+
+SPEC = PREDICTORS["Lung Cancer"]
+# Inputs shown in the left column; the rest go in the right one.
+LEFT_COLUMN_INPUTS = 8
+
+
+def add_input(spec):
+    if spec["widget"] == "slider":
+        return st.slider(spec["label"], spec["min"], spec["max"])
+    answer = st.selectbox(spec["label"], list(spec["options"]))
+    return spec["options"][answer]
+
+
+def describe_answer(spec, value):
+    if spec["widget"] == "slider":
+        return str(value)
+    return next(label for label, option in spec["options"].items() if option == value)
+
+
+def add_lung_explanation(values, prediction):
+    explanation = prediction["explanation"]
+    st.caption(f"The decision path behind this prediction: {explanation['base']:.1%} of the training patients have "
+               f"lung cancer, and each question on the path moves that to the share among the patients who "
+               f"answered the same way")
+    inputs = SPEC["inputs"]
+    st.dataframe(
+        [
+            {"question": inputs[i]["label"], "answer": describe_answer(inputs[i], values[i]),
+             "split": f"{inputs[i]['name']} {'<=' if left else '>'} {threshold:g}",
+             "risk after": f"{proba:.1%}", "change": f"{change:+.1%}"}
+            for i, threshold, left, proba, change in zip(explanation["feature"], explanation["threshold"],
+                                                         explanation["went_left"], explanation["proba"],
+                                                         explanation["change"])
+        ],
+        hide_index=True,
+    )
+
+
+def add_lung_sensitivity(values, prediction):
+    sweeps = lung_sensitivity(values)
+    rows = [
+        {"input": spec["name"].replace("_", " "), "lowest risk": float(curve.min()),
+         "highest risk": float(curve.max())}
+        for spec, curve in zip(SPEC["inputs"], sweeps["proba"])
+    ]
+    rows.sort(key=lambda row: row["highest risk"] - row["lowest risk"], reverse=True)
+    st.caption("Probability of lung cancer across every answer to each question, with the others unchanged")
+    st.dataframe(rows, hide_index=True)
+
+
+VISUALISATIONS = {
+    "explanation": add_lung_explanation,
+    "sensitivity": add_lung_sensitivity,
+}
+
+
+@st.fragment
+@timed("lung_fragment")
+def lung_cancer():
+    mark_used("Lung Cancer")
+    col1, col2 = st.columns(2)
+
+    # Values are collected in the order of SPEC["inputs"], which is the
+    # column order of the lung model.
+    with col1:
+        values = [add_input(spec) for spec in SPEC["inputs"][:LEFT_COLUMN_INPUTS]]
+
+    with col2:
+        values += [add_input(spec) for spec in SPEC["inputs"][LEFT_COLUMN_INPUTS:]]
+
+        if st.button("Make Prediction"):
+            prediction = cached_lung_prediction(values)
+            proba = prediction["proba"]
+
+            if proba[1] > operating_threshold(st.session_state, "Lung Cancer"):
+                st.subheader("Prediction : Has Lung Cancer")
+            else:
+                st.subheader("Prediction: No Lung Cancer")
+            for name in SPEC["visualisations"]:
+                VISUALISATIONS[name](values, prediction)
@@ -0,0 +1,193 @@
+import importlib
+import os
+import threading
+import time
+
+from dataset_cache import BREAST_CSV
+from model_registry import REGISTRY
+from predictors import BREAST_ARTIFACT_PATH, BREAST_STATS_PATH, LUNG_ARTIFACT_PATH, LUNG_FEATURES, evict_artifacts
+
+
+def slider(name, label, min_value=None, max_value=None):
+    # A None bound is taken from the observed range of the training data.
+    return {"name": name, "label": label, "widget": "slider", "min": min_value, "max": max_value}
+
+
+def choice(name, label, options):
+    # options maps each displayed answer to the value the model was trained on.
+    return {"name": name, "label": label, "widget": "selectbox", "options": options}
+
+
+YES_NO = {"Yes": 2, "No": 1}
+
+BREAST_INPUTS = [
+    slider(f"{feature}_{group}", f"{label} ({group})", min_value=0.0)
+    for group in ("mean", "se", "worst")
+    for feature, label in (
+        ("radius", "Radius"), ("texture", "Texture"), ("perimeter", "Perimeter"), ("area", "Area"),
+        ("smoothness", "Smoothness"), ("compactness", "Compactness"), ("concavity", "Concavity"),
+        ("concave points", "Concave points"), ("symmetry", "Symmetry"), ("fractal_dimension", "Fractal dimension"),
+    )
+]
+
+LUNG_INPUTS = [
+    choice("gender", "Select the patient's gender", {"Male": 0, "Female": 1}),
+    slider("age", "Enter the age of the patient", 0, 100),
+    choice("smoker", "Does the patient smoke?", YES_NO),
+    choice("yellow_fingers", "Does the patient have yellow fingers?", YES_NO),
+    choice("anxiety", "Does the patient have anxiety?", YES_NO),
+    choice("peer_pressure", "Is the patient affected by peer pressure?", YES_NO),
+    choice("chronic_diseases", "Does the patient's family have a history with chronic diseases?", YES_NO),
+    choice("fatigue", "Does the patient suffer from occasional fatigue?", YES_NO),
+    choice("allergy", "Does the patient suffer from allergies?", YES_NO),
+    choice("wheezing", "Does the patient wheeze?", YES_NO),
+    choice("alcohol", "Does the patient consume alcohol?", YES_NO),
+    choice("cough", "Does the patient cough?", YES_NO),
+    choice("shortness_of_breath", "Does the patient suffer from shortness of breath?", YES_NO),
+    choice("swallowing_difficulty", "Does the patient have difficulties in swallowing?", YES_NO),
+    choice("chest_pain", "Does the patient have chest pains?", YES_NO),
+]
+
+if [spec["name"] for spec in LUNG_INPUTS] != LUNG_FEATURES:
+    raise ValueError("LUNG_INPUTS must follow the lung model's column order")
+
+
+# Probability above which a prediction is positive, until a session picks
+# another operating threshold on the Model Evaluation page.
+DEFAULT_THRESHOLD = 0.5
+
+
+def placeholder():
+    return {"page": None, "render": None, "inputs": [], "artifacts": (), "visualisations": [], "evaluation": None,
+            "threshold": DEFAULT_THRESHOLD}
+
+
+# One entry per page, in selector order. "page" names the module that draws
+# it and is only imported when a session first opens the page; "artifacts"
+# are the registry paths it loads, which is what gets evicted; "evaluation"
+# is the model name predictors.model_evaluation scores.
+PREDICTORS = {
+    "Breast Cancer": {
+        "page": "breast_page",
+        "render": "breast_cancer",
+        "inputs": BREAST_INPUTS,
+        "artifacts": (BREAST_ARTIFACT_PATH, BREAST_STATS_PATH, BREAST_CSV),
+        "visualisations": ["radar", "contributions", "sensitivity", "similar_cases"],
+        "evaluation": "breast",
+        "threshold": DEFAULT_THRESHOLD,
+    },
+    "Leukemia": placeholder(),
+    "Lung Cancer": {
+        "page": "lung_page",
+        "render": "lung_cancer",
+        "inputs": LUNG_INPUTS,
+        "artifacts": (LUNG_ARTIFACT_PATH,),
+        "visualisations": ["explanation", "sensitivity"],
+        "evaluation": "lung",
+        "threshold": DEFAULT_THRESHOLD,
+    },
+    "Pancreatic Cancer": placeholder(),
+    "Prostate Cancer": placeholder(),
+    "Model Evaluation": {
+        **placeholder(),
+        "page": "evaluation_page",
+        "render": "evaluation_dashboard",
+        # Only reads the artifacts of the predictors above, which they own.
+        "artifacts": (),
+    },
+}
+
+# Memory held by loaded predictor artifacts above which the least recently
+# used predictors are evicted; unset or 0 disables eviction.
+MEMORY_LIMIT = int(os.environ.get("PREDICTOR_MEMORY_LIMIT_MB", 0)) * 2 ** 20
+# Predictors used this recently may be mid-rerun in another session and are
+# not evicted.
+EVICTION_GRACE_S = 10
+
+_last_used = {}
+_evictions = {}
+_lock = threading.Lock()
+
+
+def threshold_key(name):
+    # Session state key holding the operating threshold a session chose for
+    # the named predictor.
+    return f"{name} threshold"
+
+
+def operating_threshold(state, name):
+    return state.get(threshold_key(name), PREDICTORS[name]["threshold"])
+
+
+def mark_used(name):
+    # Called on every rerun that reads the predictor's artifacts, fragment
+    # reruns included, which do not pass through load_page.
+    _last_used[name] = time.monotonic()
+
+
+def load_page(name):
+    # Returns the page's render function, or None for a placeholder.
+    spec = PREDICTORS[name]
+    mark_used(name)
+    if spec["page"] is None:
+        return None
+    return getattr(importlib.import_module(spec["page"]), spec["render"])
+
+
+def is_loaded(name):
+    return any(REGISTRY.is_loaded(path) for path in PREDICTORS[name]["artifacts"])
+
+
+def evict(name):
+    with _lock:
+        evict_artifacts(PREDICTORS[name]["artifacts"])
+        _evictions[name] = _evictions.get(name, 0) + 1
+
+
+def loaded_artifact_bytes():
+    # Array bytes the registry measured for each loaded artifact. The process
+    # RSS is not used: most of it is the interpreter and imported libraries,
+    # which eviction cannot give back.
+    return {
+        path: row["memory"]
+        for path, row in REGISTRY.stats().items()
+        if row["loaded"]
+    }
+
+
+def relieve_memory_pressure(keep=None, limit=MEMORY_LIMIT):
+    # Evicts loaded predictors, least recently used first, until the loaded
+    # artifacts fit in the limit. The page being drawn, and any predictor
+    # another session used within EVICTION_GRACE_S, is never evicted.
+    if not limit:
+        return []
+    held = loaded_artifact_bytes()
+    if sum(held.values()) <= limit:
+        return []
+
+    evicted = []
+    now = time.monotonic()
+    for name, used in sorted(list(_last_used.items()), key=lambda item: item[1]):
+        if name == keep or now - used < EVICTION_GRACE_S or not is_loaded(name):
+            continue
+        evict(name)
+        evicted.append(name)
+        for path in PREDICTORS[name]["artifacts"]:
+            held.pop(os.path.abspath(path), None)
+        if sum(held.values()) <= limit:
+            break
+    return evicted
+
+
+def predictor_status():
+    now = time.monotonic()
+    return [
+        {
+            "predictor": name,
+            "loaded": is_loaded(name),
+            "idle_s": round(now - _last_used[name], 1) if name in _last_used else None,
+            "evictions": _evictions.get(name, 0),
+        }
+        for name, spec in PREDICTORS.items()
+        if spec["artifacts"]
+    ]
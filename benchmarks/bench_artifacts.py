@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from bench_common import MODEL_DIR
+
+# Each variant runs in a fresh interpreter, so the time includes the imports
+# the loader pulls in, which is what a cold start of the app pays.
+PICKLE_LOAD = """
+import pickle, warnings
+warnings.filterwarnings("ignore")
+for name in ("breast_cancer_model.pkl", "breast_cancer_scaler.pkl", "lung_decision_tree_model.pkl"):
+    with open(name, "rb") as f:
+        pickle.load(f)
+"""
+
+ARTIFACT_LOAD = """
+from fused_model import load_fused
+from tree_compiler import load_compiled
+load_fused("artifacts/breast_cancer/manifest.json")
+load_compiled("artifacts/lung_cancer/manifest.json")
+"""
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+exec(compile({code!r}, "<load>", "exec"))
+print(time.perf_counter() - start, any(m.startswith("sklearn") for m in sys.modules))
+"""
+
+
+def cold_load(code, repeat):
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], cwd=MODEL_DIR, env={
+            **os.environ, "PYTHONPATH": MODEL_DIR}, capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+    return np.median(times), out[1] == "True"
+
+
+def main(repeat=7):
+    # Interpreter start-up is common to both and excluded.
+    pickle_time, pickle_sklearn = cold_load(PICKLE_LOAD, repeat)
+    artifact_time, artifact_sklearn = cold_load(ARTIFACT_LOAD, repeat)
+    print(f"pickles     {pickle_time * 1e3:8.1f} ms   imports sklearn: {pickle_sklearn}")
+    print(f"artifacts   {artifact_time * 1e3:8.1f} ms   imports sklearn: {artifact_sklearn}")
+    print(f"speedup     {pickle_time / artifact_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import subprocess
+import sys
+
+import numpy as np
+
+from bench_common import APP_DIR, APP_PATH, MODEL_DIR
+
+HEAVY_MODULES = ["plotly", "pandas", "scipy", "sklearn", "pyarrow"]
+
+# Runs in a fresh interpreter with -X importtime. Streamlit itself is
+# imported first; the marker separates its imports from those the first
+# script run of the app triggers.
+COLD_START = """
+import sys, time, warnings
+warnings.filterwarnings("ignore")
+sys.path.insert(0, {model_dir!r})
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+import streamlit.logger
+streamlit.logger.set_log_level("error")
+booted = time.perf_counter()
+loaded = set(sys.modules)
+sys.stderr.write("--- app\\n")
+sys.stderr.flush()
+at = AppTest.from_file({app_path!r}, default_timeout=120)
+at.session_state["cancer_type"] = {page!r}
+at.run()
+assert not at.exception, at.exception
+done = time.perf_counter()
+from model_registry import current_rss
+heavy = [m for m in {heavy!r} if m in sys.modules and m not in loaded]
+print(booted - start, done - booted, current_rss(), ",".join(heavy) or "-")
+"""
+
+
+def parse_importtime(stderr):
+    # Lines look like "import time:  self [us] | cumulative | imported package";
+    # nested imports are indented, so top-level ones carry the package cost.
+    app_imports = []
+    seen_marker = False
+    for line in stderr.splitlines():
+        if line.startswith("--- app"):
+            seen_marker = True
+        elif seen_marker and line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+                app_imports.append((int(cumulative), name.strip()))
+    return sorted(app_imports, reverse=True)
+
+
+def cold_start(page):
+    code = COLD_START.format(model_dir=MODEL_DIR, app_path=APP_PATH, page=page, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR, capture_output=True,
+                            text=True, check=True)
+    boot, first_run, rss, heavy = result.stdout.split()[-4:]
+    return float(boot), float(first_run), int(rss), heavy.strip("-"), parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start of app/main.py per page")
+    parser.add_argument("--pages", nargs="+", default=["Breast Cancer", "Lung Cancer"])
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list per page")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh processes per page; medians are reported")
+    args = parser.parse_args()
+
+    for page in args.pages:
+        runs = [cold_start(page) for _ in range(args.repeat)]
+        boot, first_run, rss = (np.median([run[i] for run in runs]) for i in range(3))
+        heavy, imports = runs[-1][3], runs[-1][4]
+        print(f"{page}: streamlit import {boot * 1e3:.0f} ms, first script run {first_run * 1e3:.0f} ms, "
+              f"RSS {rss / 2 ** 20:.1f} MiB")
+        print(f"  heavy modules loaded by the app: {heavy.replace(',', ', ') or 'none'}")
+        for cumulative, name in imports[:args.top]:
+            print(f"  {cumulative / 1e3:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
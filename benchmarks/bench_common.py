@@ -0,0 +1,17 @@
+import os
+import sys
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT_DIR, "app")
+APP_PATH = os.path.join(APP_DIR, "main.py")
+MODEL_DIR = os.path.join(ROOT_DIR, "model")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The benchmarks import the model modules the way app/main.py does.
+if MODEL_DIR not in sys.path:
+    sys.path.append(MODEL_DIR)
+
+
+def best_of(stmt, number, repeat=5):
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
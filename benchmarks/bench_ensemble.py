@@ -0,0 +1,49 @@
+import sys
+
+import numpy as np
+
+from bench_common import best_of
+
+from fused_model import load_fused, score, score_ensemble
+from predictors import BREAST_ARTIFACT_PATH, PREDICTION_CACHE, cached_breast_prediction, get_breast_stats
+
+
+def member_loop(fused, x):
+    # One scoring call per bootstrap member, as separately stored models
+    # would be evaluated.
+    members = [{"weights": w, "bias": b} for w, b in zip(fused["ensemble_weights"], fused["ensemble_bias"])]
+    return lambda: [score(member, x) for member in members]
+
+
+def main():
+    fused = load_fused(BREAST_ARTIFACT_PATH)
+    if "ensemble_weights" not in fused:
+        sys.exit("The breast artifact has no bootstrap ensemble; retrain with --bootstrap")
+    stats = get_breast_stats()
+    members = len(fused["ensemble_weights"])
+
+    x = stats["mean"].reshape(1, -1)
+    proba, _ = score_ensemble(fused, x)
+    if not np.allclose(proba, score(fused, x)[1], rtol=0, atol=1e-12):
+        raise ValueError("score_ensemble's point prediction differs from score")
+
+    single = best_of(lambda: score(fused, x), 5000)
+    stacked = best_of(lambda: score_ensemble(fused, x), 5000)
+    loop = best_of(member_loop(fused, x), 50)
+    print(f"single row, {members} members   model only {single * 1e6:7.1f} us   "
+          f"stacked with interval {stacked * 1e6:7.1f} us   per-member loop {loop * 1e6:8.1f} us")
+
+    rng = np.random.default_rng(0)
+    rows = rng.uniform(stats["min"], stats["max"], size=(2000, len(stats["features"])))
+
+    def misses():
+        PREDICTION_CACHE.invalidate("breast")
+        for row in rows:
+            cached_breast_prediction(row)
+
+    miss = best_of(misses, 1, repeat=3) / len(rows)
+    print(f"cached_breast_prediction on a cache miss, including the interval   {miss * 1e6:7.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+
+from bench_common import best_of
+
+from dataset_cache import load_dataset
+from evaluation import evaluate, threshold_curves
+from predictors import PREDICTION_CACHE, model_evaluation, predict_breast, predict_lung
+
+
+def thresholded_curves(y, score):
+    # One thresholded prediction per distinct score, as a loop over
+    # thresholds would compute the confusion matrices.
+    y = np.asarray(y).astype(bool)
+    rows = []
+    for threshold in np.r_[np.unique(score)[::-1], -np.inf]:
+        predicted = score > threshold
+        rows.append((np.sum(predicted & y), np.sum(predicted & ~y)))
+    return np.array(rows)
+
+
+def compare(name, y, score):
+    curves = threshold_curves(y, score)
+    if not np.array_equal(thresholded_curves(y, score), np.column_stack([curves["tp"], curves["fp"]])):
+        raise ValueError(f"Sorted {name} curves differ from thresholded predictions")
+
+    number = max(1, 20_000 // len(score))
+    loop_time = best_of(lambda: thresholded_curves(y, score), max(1, number // 100), repeat=3)
+    sorted_time = best_of(lambda: evaluate(y, score), number)
+    print(f"{name:10s} {len(score):7d} rows {len(curves['threshold']):7d} thresholds   "
+          f"per threshold {loop_time * 1e3:9.2f} ms   sorted pass (all curves) {sorted_time * 1e3:7.3f} ms   "
+          f"speedup {loop_time / sorted_time:8.1f}x")
+
+
+def main():
+    breast = load_dataset("breast")
+    compare("breast", breast["y"], predict_breast(breast["X"])[:, 1])
+    lung = load_dataset("lung")
+    compare("lung", lung["y"], predict_lung(lung["X"])[:, 1])
+
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 100_000)
+    compare("synthetic", y, np.clip(rng.normal(0.35 + 0.3 * y, 0.2), 0, 1))
+
+    PREDICTION_CACHE.clear()
+    cold = best_of(lambda: (PREDICTION_CACHE.invalidate("breast_evaluation"), model_evaluation("breast")), 20)
+    cached = best_of(lambda: model_evaluation("breast"), 1000)
+    print(f"model_evaluation('breast')   computed {cold * 1e3:.3f} ms   cached {cached * 1e3:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
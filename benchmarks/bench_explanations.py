@@ -0,0 +1,72 @@
+import warnings
+
+import numpy as np
+
+from bench_common import best_of
+
+from model_registry import load_pickle
+from fused_model import contributions, score
+from tree_compiler import domain_samples, path_contributions
+from predictors import (BREAST_MODEL_PATH, BREAST_SCALER_PATH, LUNG_MODEL_PATH, get_breast_stats, get_fused_model,
+                        get_lung_tree)
+
+
+def occlusion_contributions(fused, x, background, samples=200, seed=0):
+    # A generic model-agnostic estimate for comparison: each feature's
+    # average change in log-odds when it is replaced by background rows.
+    rng = np.random.default_rng(seed)
+    rows = background[rng.integers(0, len(background), samples)]
+    base = np.log(score(fused, x)[1][0, 1]) - np.log(score(fused, x)[1][0, 0])
+    estimate = np.empty(len(x))
+    for i in range(len(x)):
+        X = np.repeat(x[None], samples, axis=0)
+        X[:, i] = rows[:, i]
+        proba = score(fused, X)[1]
+        estimate[i] = base - np.mean(np.log(proba[:, 1]) - np.log(proba[:, 0]))
+    return estimate
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    stats = get_breast_stats()
+    fused = get_fused_model()
+    model, scaler = load_pickle(BREAST_MODEL_PATH), load_pickle(BREAST_SCALER_PATH)
+    rng = np.random.default_rng(0)
+    X = rng.uniform(stats["min"], stats["max"], size=(10_000, len(stats["features"])))
+
+    contribution, base = contributions(fused, X)
+    if not np.allclose(contribution, scaler.transform(X) * model.coef_[0], rtol=0, atol=1e-9):
+        raise ValueError("Breast contributions differ from scaled value x coefficient")
+    if not np.allclose(contribution.sum(axis=1) + base, model.decision_function(scaler.transform(X)), atol=1e-9):
+        raise ValueError("Breast contributions do not add up to the model's log-odds")
+    print("Breast contributions verified on", len(X), "random rows")
+
+    x = X[0]
+    exact = best_of(lambda: contributions(fused, x), 5000)
+    sampled = best_of(lambda: occlusion_contributions(fused, x, X), 20)
+    print(f"breast single row   exact {exact * 1e6:8.1f} us   occlusion sampling (200 rows/feature) "
+          f"{sampled * 1e3:8.2f} ms")
+
+    compiled = get_lung_tree()
+    clf = load_pickle(LUNG_MODEL_PATH)
+    samples = domain_samples(2000)
+    indicator = clf.decision_path(samples.astype(np.float32))
+    for row, x in enumerate(samples):
+        explanation = path_contributions(compiled, x)
+        nodes = indicator.indices[indicator.indptr[row]:indicator.indptr[row + 1]]
+        if not np.array_equal(explanation["path"], nodes):
+            raise ValueError("Lung decision path differs from sklearn's decision_path")
+        # Normalised because trees pickled by older sklearn releases return
+        # class counts from predict_proba.
+        proba = clf.predict_proba(x[None].astype(np.float32))[0]
+        leaf = proba[1] / proba.sum()
+        if not np.isclose(explanation["base"] + explanation["change"].sum(), leaf, rtol=0, atol=1e-12):
+            raise ValueError("Lung split contributions do not add up to the leaf probability")
+    print("Lung decision paths verified on", len(samples), "domain samples")
+
+    lung = best_of(lambda: path_contributions(compiled, samples[0]), 5000)
+    print(f"lung single row     decision path and split contributions {lung * 1e6:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
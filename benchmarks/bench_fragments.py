@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+
+import numpy as np
+
+from load_test import Session, free_port, start_server
+
+FRAGMENTS = {"Breast Cancer": "breast_fragment", "Lung Cancer": "lung_fragment"}
+
+
+def server_spans(log):
+    # Spans the server logged since the last call (PERF_LOG=1), by name.
+    spans = {}
+    for line in log.read().splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "span" in record:
+            spans[record["span"]] = spans.get(record["span"], 0.0) + record["ms"]
+    return spans
+
+
+async def measure(url, log, page, iterations, seed):
+    # One browser tab moves a random slider, alternately as the frontend sends
+    # it (a rerun of the slider's fragment only) and as a whole-script rerun.
+    # Wall time includes Streamlit's own message round trips; the server time
+    # is the app's logged work for that run: the page body on a full rerun,
+    # the fragment alone on a fragment rerun.
+    session = Session(url, random.Random(seed))
+    await session.connect()
+    await session.rerun()
+    if page != "Breast Cancer":
+        await session.select_page(page)
+    server_spans(log)
+
+    wall = {True: [], False: []}
+    work = {True: [], False: []}
+    for i in range(iterations):
+        for fragment in (i % 2 == 0, i % 2 == 1):
+            wall[fragment].append(await session.move_slider(fragment) * 1000)
+            spans = server_spans(log)
+            work[fragment].append(spans[FRAGMENTS[page]] if fragment else spans["rerun"])
+    await session.close()
+    if session.errors:
+        raise RuntimeError(f"{page}: the app raised {session.errors} exceptions")
+    return wall, work
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time slider moves as fragment reruns and as full reruns "
+                                                 "against a local Streamlit server")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # The server appends to the file through its own descriptor, so reading
+    # here does not move its write position.
+    with tempfile.NamedTemporaryFile("ab") as output, open(output.name) as log:
+        port = free_port()
+        server = start_server(port, env={"PERF_LOG": "1"}, log=output)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        try:
+            # Warm-up, so imports and artifact loads are not billed to either side.
+            for page in FRAGMENTS:
+                asyncio.run(measure(url, log, page, 2, args.seed))
+            for page in FRAGMENTS:
+                wall, work = asyncio.run(measure(url, log, page, args.iterations, args.seed))
+                print(f"{page:<14} server work p50: full rerun {np.median(work[False]):7.2f} ms   "
+                      f"fragment rerun {np.median(work[True]):7.2f} ms   "
+                      f"saved {100 * (1 - np.median(work[True]) / np.median(work[False])):5.1f}%   "
+                      f"(wall p50 {np.median(wall[False]):6.1f} / {np.median(wall[True]):6.1f} ms)")
+        finally:
+            server.terminate()
+            server.wait()
+
+    print("With 'Apply slider changes together' on, N slider moves cost one fragment rerun instead of N.")
+
+
+if __name__ == '__main__':
+    main()
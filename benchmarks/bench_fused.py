@@ -0,0 +1,45 @@
+import warnings
+
+import numpy as np
+
+from bench_common import best_of
+
+from model_registry import load_pickle
+from fused_model import load_fused, score, verify_fused
+from predictors import BREAST_ARTIFACT_PATH, BREAST_MODEL_PATH, BREAST_SCALER_PATH, get_breast_stats
+
+
+def sklearn_single(model, scaler, x):
+    # The four sklearn calls add_predictions used to make per rerun.
+    scaled = scaler.transform(x)
+    model.predict(scaled)
+    model.predict_proba(scaled)
+    model.predict_proba(scaled)
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    model = load_pickle(BREAST_MODEL_PATH)
+    scaler = load_pickle(BREAST_SCALER_PATH)
+    fused = load_fused(BREAST_ARTIFACT_PATH)
+    stats = get_breast_stats()
+
+    rng = np.random.default_rng(0)
+    batch = rng.uniform(stats["min"], stats["max"], size=(100_000, len(stats["features"])))
+    verify_fused(fused, model, scaler, batch)
+    print("Equivalence with the sklearn pipeline verified on", len(batch), "random rows")
+
+    x = stats["mean"].reshape(1, -1)
+    single_sklearn = best_of(lambda: sklearn_single(model, scaler, x), 500)
+    single_fused = best_of(lambda: score(fused, x), 5000)
+    print(f"single row   sklearn {single_sklearn * 1e6:9.1f} us   fused {single_fused * 1e6:9.1f} us"
+          f"   speedup {single_sklearn / single_fused:6.1f}x")
+
+    batch_sklearn = best_of(lambda: model.predict_proba(scaler.transform(batch)), 5)
+    batch_fused = best_of(lambda: score(fused, batch), 5)
+    print(f"100k rows    sklearn {batch_sklearn * 1e3:9.1f} ms   fused {batch_fused * 1e3:9.1f} ms"
+          f"   speedup {batch_sklearn / batch_fused:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import gc
+import json
+import os
+import random
+import tracemalloc
+import warnings
+
+import numpy as np
+
+from bench_common import APP_DIR, APP_PATH, MODEL_DIR, ROOT_DIR
+
+OWN_CODE = (APP_DIR + os.sep, MODEL_DIR + os.sep)
+
+
+def own_frame(trace):
+    # The innermost frame of an allocation that is in app/ or model/, so
+    # memory allocated inside plotly or numpy on the app's behalf is billed
+    # to the line of app code that asked for it.
+    for frame in reversed(trace.traceback):
+        if frame.filename.startswith(OWN_CODE):
+            return f"{os.path.relpath(frame.filename, ROOT_DIR)}:{frame.lineno}"
+    return None
+
+
+def attribute(snapshot, baseline):
+    by_line = {}
+    for diff in snapshot.compare_to(baseline, "traceback"):
+        if diff.size_diff <= 0:
+            continue
+        line = own_frame(diff)
+        if line is not None:
+            by_line[line] = by_line.get(line, 0) + diff.size_diff
+    return by_line
+
+
+def new_session(page):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.session_state["cancer_type"] = page
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def interact(at, rng):
+    # One rerun of the kind the page sees most: a breast slider moved, or a
+    # lung question answered followed by Make Prediction.
+    if at.session_state["cancer_type"] == "Breast Cancer":
+        slider = rng.choice(list(at.sidebar.slider))
+        slider.set_value(rng.uniform(slider.min, slider.max))
+    else:
+        question = rng.choice(list(at.selectbox)[1:])
+        question.set_value(rng.choice(question.options))
+        at.button[0].click()
+    at.run()
+    assert not at.exception, at.exception
+
+
+def measure_reruns(page, reruns, rng):
+    at = new_session(page)
+    for _ in range(5):
+        interact(at, rng)
+
+    peaks, retained = [], []
+    for _ in range(reruns):
+        gc.collect()
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        interact(at, rng)
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        peaks.append(peak - start)
+        retained.append(tracemalloc.get_traced_memory()[0] - start)
+    return {
+        "peak_kib_p50": float(np.percentile(peaks, 50)) / 1024,
+        "peak_kib_p95": float(np.percentile(peaks, 95)) / 1024,
+        "retained_kib_mean": float(np.mean(retained)) / 1024,
+    }
+
+
+def measure_sessions(page, sessions, actions, rng):
+    # Sessions are kept alive, as connected browser tabs would be, and the
+    # memory still held once they have all interacted is split between them.
+    warm = new_session(page)
+    interact(warm, rng)
+    del warm
+    gc.collect()
+
+    baseline = tracemalloc.take_snapshot()
+    start = tracemalloc.get_traced_memory()[0]
+    alive = []
+    for _ in range(sessions):
+        at = new_session(page)
+        for _ in range(actions):
+            interact(at, rng)
+        alive.append(at)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - start
+    by_line = attribute(tracemalloc.take_snapshot(), baseline)
+    top = sorted(by_line.items(), key=lambda item: item[1], reverse=True)[:8]
+    return {
+        "sessions": sessions,
+        "per_session_kib": retained / sessions / 1024,
+        "own_code_per_session_kib": sum(by_line.values()) / sessions / 1024,
+        "top_own_lines": [{"line": line, "kib_per_session": size / sessions / 1024} for line, size in top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory allocated per rerun and retained per session")
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--actions", type=int, default=5, help="interactions per session before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    rng = random.Random(args.seed)
+    results = {}
+    for page in ("Breast Cancer", "Lung Cancer"):
+        # Deep tracebacks are only needed to attribute what sessions retain,
+        # and make every allocation much slower to trace.
+        tracemalloc.start(1)
+        rerun = measure_reruns(page, args.reruns, rng)
+        tracemalloc.stop()
+        tracemalloc.start(40)
+        session = measure_sessions(page, args.sessions, args.actions, rng)
+        tracemalloc.stop()
+        results[page] = {"rerun": rerun, "session": session}
+
+    for page, result in results.items():
+        rerun, session = result["rerun"], result["session"]
+        print(f"{page}: per rerun peak p50 {rerun['peak_kib_p50']:8.1f} KiB, p95 {rerun['peak_kib_p95']:8.1f} KiB, "
+              f"retained {rerun['retained_kib_mean']:6.1f} KiB")
+        print(f"  per session {session['per_session_kib']:8.1f} KiB retained, "
+              f"{session['own_code_per_session_kib']:6.1f} KiB of it allocated by app/ and model/")
+        for row in session["top_own_lines"]:
+            print(f"    {row['kib_per_session']:7.1f} KiB  {row['line']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from bench_common import best_of
+
+from dataset_cache import load_dataset
+from neighbours import build_case_index, nearest_cases
+from predictors import get_fused_model
+
+
+def linear_scan(X, mean, scale, x, k):
+    # Distance to every reference case, as a per-rerun scan would compute.
+    d = np.sqrt((((X - mean) / scale - (x - mean) / scale) ** 2).sum(axis=1))
+    rows = np.argsort(d)[:k]
+    return rows, d[rows]
+
+
+def main():
+    dataset = load_dataset("breast")
+    fused = get_fused_model()
+    X, y = np.asarray(dataset["X"]), np.asarray(dataset["y"])
+    rng = np.random.default_rng(0)
+    queries = X[rng.integers(0, len(X), 200)] * rng.normal(1, 0.02, (200, X.shape[1]))
+
+    for rows in (len(X), 100_000, 500_000):
+        # Larger reference sets are resampled from data.csv with 5% noise.
+        if rows == len(X):
+            reference, labels = X, y
+        else:
+            pick = rng.integers(0, len(X), rows)
+            reference, labels = X[pick] * rng.normal(1, 0.05, (rows, X.shape[1])), y[pick]
+
+        start = time.perf_counter()
+        index = build_case_index(reference, labels, fused["mean"], fused["scale"])
+        build = time.perf_counter() - start
+
+        for x in queries[:20]:
+            found, distance, _ = nearest_cases(index, x, 5)
+            _, expected = linear_scan(reference, fused["mean"], fused["scale"], x, 5)
+            if not np.allclose(distance, expected):
+                raise ValueError("k-d tree neighbours differ from a linear scan")
+
+        query = best_of(lambda: [nearest_cases(index, x, 5) for x in queries], 1)
+        scan = best_of(lambda: linear_scan(reference, fused["mean"], fused["scale"], queries[0], 5), 3, repeat=3)
+        print(f"{rows:7d} cases   build {build * 1e3:8.1f} ms   query {query / len(queries) * 1e3:6.3f} ms"
+              f"   linear scan {scan * 1e3:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import warnings
+
+import plotly.graph_objects as go
+import plotly.io
+import plotly.tools
+
+from bench_common import best_of
+from bench_rerun import load_page
+
+
+def legacy_radar_chart(app, input_data):
+    # The per-rerun figure construction get_radar_chart used before the
+    # cached template.
+    scaled = app.get_scaled_values(input_data)
+    fig = go.Figure()
+    for group, name in app.RADAR_GROUPS:
+        fig.add_trace(go.Scatterpolar(r=[scaled[f"{feature}_{group}"] for feature in app.RADAR_FEATURES],
+                                      theta=app.RADAR_CATEGORIES, fill='toself', name=name))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 1])), showlegend=True, height=600,
+                      width=800)
+    return fig
+
+
+def serialise(fig):
+    # What st.plotly_chart does with the figure before sending it.
+    figure = plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True)
+    return plotly.io.to_json(figure, validate=False)
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    app = load_page("breast_page")
+    stats = app.get_feature_stats()
+    input_data = dict(zip(stats["features"], stats["mean"].tolist()))
+
+    for name, build in (("legacy", lambda: legacy_radar_chart(app, input_data)),
+                        ("template", lambda: app.get_radar_chart(input_data))):
+        payload = len(serialise(build()))
+        build_ms = best_of(build, 200) * 1000
+        total_ms = best_of(lambda: serialise(build()), 200) * 1000
+        print(f"{name:<9} payload {payload:6d} bytes   build {build_ms:6.3f} ms   build+serialise {total_ms:6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from bench_common import APP_DIR, APP_PATH, BENCH_DIR
+
+
+def load_app():
+    # `streamlit run` puts the script's directory on sys.path; do the same.
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    spec = importlib.util.spec_from_file_location("app_main", APP_PATH)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+def load_page(name):
+    # Page modules import from model/, which app/main.py puts on sys.path.
+    load_app()
+    return importlib.import_module(name)
+
+
+def time_calls(fn, iterations):
+    fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarise(samples):
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "mean_ms": float(np.mean(samples)),
+        "iterations": len(samples),
+    }
+
+
+def bench_stages(app, iterations):
+    from predictors import predict_lung
+
+    stats = app.get_feature_stats()
+    input_data = dict(zip(stats["features"], stats["mean"].tolist()))
+    lung_row = [[0, 60, 2, 2, 1, 1, 2, 2, 1, 2, 2, 2, 2, 1, 2]]
+
+    return {
+        "load_feature_stats": time_calls(app.get_feature_stats, iterations),
+        "get_scaled_values": time_calls(lambda: app.get_scaled_values(input_data), iterations),
+        "get_radar_chart": time_calls(lambda: app.get_radar_chart(input_data), iterations),
+        "add_predictions": time_calls(lambda: app.add_predictions(input_data), iterations),
+        "lung_predict": time_calls(lambda: predict_lung(lung_row), iterations),
+    }
+
+
+def bench_reruns(iterations):
+    from streamlit.testing.v1 import AppTest
+
+    breast = AppTest.from_file(APP_PATH, default_timeout=60)
+    breast.run()
+
+    def breast_rerun():
+        breast.run()
+        assert not breast.exception, breast.exception
+
+    lung = AppTest.from_file(APP_PATH, default_timeout=60)
+    lung.run()
+    lung.selectbox[0].set_value("Lung Cancer").run()
+
+    def lung_rerun():
+        lung.button[0].click().run()
+        assert not lung.exception, lung.exception
+
+    return {
+        "rerun_breast_cancer": time_calls(breast_rerun, iterations),
+        "rerun_lung_cancer": time_calls(lung_rerun, iterations),
+    }
+
+
+def check_thresholds(results, thresholds):
+    failures = []
+    for name, limits in thresholds.items():
+        if name not in results:
+            # A threshold for a stage that is no longer measured would
+            # otherwise stop guarding anything without notice.
+            failures.append(f"{name} has a threshold but was not measured")
+            continue
+        for metric, limit in limits.items():
+            if metric not in results[name]:
+                failures.append(f"{name} has a {metric} threshold but no such metric")
+                continue
+            value = results[name][metric]
+            if value > limit:
+                failures.append(f"{name} {metric} {value:.2f} ms exceeds {limit:.2f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Streamlit rerun latency of app/main.py")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", default="rerun_latency.json")
+    parser.add_argument("--thresholds", default=os.path.join(BENCH_DIR, "rerun_thresholds.json"))
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    app = load_page("breast_page")
+    samples = bench_stages(app, args.iterations)
+    samples.update(bench_reruns(args.iterations))
+    results = {name: summarise(values) for name, values in samples.items()}
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    for name, summary in results.items():
+        print(f"{name:<22} p50 {summary['p50_ms']:9.3f} ms   p95 {summary['p95_ms']:9.3f} ms")
+
+    with open(args.thresholds) as f:
+        failures = check_thresholds(results, json.load(f))
+    for failure in failures:
+        print("REGRESSION:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import numpy as np
+
+from bench_common import best_of
+
+from fused_model import score
+from predictors import LUNG_GRIDS, SWEEP_POINTS, get_breast_stats, get_fused_model, get_lung_tree
+from sensitivity import sweep
+from tree_compiler import predict_proba_tree
+
+
+def single_sweeps(predict, base, grids):
+    # One prediction per (feature, grid value), as a naive panel would do.
+    curves = []
+    for i, grid in enumerate(grids):
+        curve = []
+        for value in grid:
+            x = np.array(base, dtype=float)
+            x[i] = value
+            curve.append(predict(x[None])[0, 1])
+        curves.append(np.array(curve))
+    return curves
+
+
+def compare(name, predict, base, grids):
+    batched = sweep(predict, base, grids)
+    singles = single_sweeps(predict, base, grids)
+    if not all(np.allclose(a, b, rtol=0, atol=1e-12) for a, b in zip(batched, singles)):
+        raise ValueError(f"Batched {name} sweeps differ from single predictions")
+
+    rows = sum(len(grid) for grid in grids)
+    single_time = best_of(lambda: single_sweeps(predict, base, grids), 3)
+    batched_time = best_of(lambda: sweep(predict, base, grids), 200)
+    print(f"{name:7s} {rows:4d} rows   single {single_time * 1e3:8.2f} ms   batched {batched_time * 1e3:6.3f} ms"
+          f"   speedup {single_time / batched_time:6.1f}x")
+
+
+def main():
+    stats = get_breast_stats()
+    fused = get_fused_model()
+    grids = list(np.linspace(stats["min"], stats["max"], SWEEP_POINTS, axis=1))
+    compare("breast", lambda X: score(fused, X)[1], stats["mean"], grids)
+
+    compiled = get_lung_tree()
+    compare("lung", lambda X: predict_proba_tree(compiled, X), [1, 60] + [2] * 13, LUNG_GRIDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import warnings
+
+import pandas as pd
+
+from bench_common import best_of
+
+from model_registry import load_pickle
+from predictors import LUNG_MODEL_PATH, LUNG_ARTIFACT_PATH
+from tree_compiler import (domain_samples, generate_python, load_compiled, load_generated, predict_proba_tree,
+                           verify_compiled)
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    clf = load_pickle(LUNG_MODEL_PATH)
+    compiled = load_compiled(LUNG_ARTIFACT_PATH)
+    generated = load_generated(generate_python(compiled))
+
+    X = domain_samples(1_000_000, seed=1)
+    verify_compiled(compiled, clf, X[:100_000], generated)
+    print("Exact agreement with the original tree verified on 100000 rows")
+
+    row = X[:1]
+    columns = [f'feature_{i}' for i in range(1, 16)]
+    single_sklearn = best_of(lambda: clf.predict(pd.DataFrame(row, columns=columns)), 500)
+    single_arrays = best_of(lambda: predict_proba_tree(compiled, row), 5000)
+    x = row[0].tolist()
+    single_generated = best_of(lambda: generated(x), 50000)
+    print(f"single row   sklearn+DataFrame {single_sklearn * 1e6:9.1f} us   arrays {single_arrays * 1e6:7.1f} us"
+          f"   generated {single_generated * 1e6:7.2f} us")
+
+    # The inference server's micro-batches are at most 256 rows.
+    batch = X[:256]
+    micro_sklearn = best_of(lambda: clf.predict_proba(batch), 500)
+    micro_arrays = best_of(lambda: predict_proba_tree(compiled, batch), 500)
+    print(f"256 rows     sklearn {micro_sklearn * 1e6:9.1f} us   arrays {micro_arrays * 1e6:9.1f} us")
+
+    batch_sklearn = best_of(lambda: clf.predict_proba(X), 3)
+    batch_arrays = best_of(lambda: predict_proba_tree(compiled, X), 3)
+    print(f"1M rows      sklearn {batch_sklearn * 1e3:9.1f} ms   arrays {batch_arrays * 1e3:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
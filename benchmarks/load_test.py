@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from bench_common import APP_PATH, ROOT_DIR
+
+WIDGET_TYPES = ("slider", "selectbox", "button", "radio", "checkbox")
+SELECTOR = "Select the Cancer Type to Operate "
+PREDICT_BUTTON = "Make Prediction"
+
+
+def process_rss(pid):
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, env=None, log=None):
+    command = [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+               "--server.port", str(port), "--server.fileWatcherType", "none",
+               "--browser.gatherUsageStats", "false"]
+    server = subprocess.Popen(command, cwd=ROOT_DIR, env={**os.environ, **(env or {})},
+                              stdout=subprocess.DEVNULL, stderr=log or subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.read() == b"ok":
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Streamlit server did not become healthy within 60 s")
+
+
+class Session:
+    # A headless browser tab: speaks the same protobuf-over-websocket protocol
+    # as the Streamlit frontend, keeps the widget values the way the frontend
+    # does and times each rerun until the server reports the script finished.
+
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.widgets = {}
+        self.states = {}
+        self.page_script_hash = ""
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        await self.ws.close()
+
+    async def rerun(self, triggers=(), fragment_id=""):
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page_script_hash
+        msg.rerun_script.fragment_id = fragment_id
+        for state in self.states.values():
+            msg.rerun_script.widget_states.widgets.append(state)
+        for widget_id in triggers:
+            trigger = msg.rerun_script.widget_states.widgets.add()
+            trigger.id = widget_id
+            trigger.trigger_value = True
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        seen = {}
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = fwd.new_session.page_script_hash
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    seen[widget.label] = (element_type, widget, fwd.delta.fragment_id)
+                elif element_type == "exception":
+                    self.errors += 1
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                break
+        latency = time.perf_counter() - start
+
+        if fragment_id:
+            self.widgets.update(seen)
+        else:
+            self.widgets = seen
+            ids = {widget.id for _, widget, _ in seen.values()}
+            self.states = {key: state for key, state in self.states.items() if key in ids}
+        return latency
+
+    def _set(self, label, **value):
+        # Records the widget's new value, as the frontend does when it is
+        # changed, and returns the fragment the widget belongs to.
+        _, widget, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget.id)
+        for field, v in value.items():
+            if field == "double_array_value":
+                state.double_array_value.data.extend(v)
+            else:
+                setattr(state, field, v)
+        self.states[widget.id] = state
+        return fragment_id
+
+    async def select_page(self, page):
+        self._set(SELECTOR, string_value=page)
+        return await self.rerun()
+
+    async def move_slider(self, fragment=True):
+        # fragment=False reruns the whole script for the same change, as every
+        # widget change did before the pages were split into fragments.
+        sliders = [label for label, (kind, _, _) in self.widgets.items() if kind == "slider"]
+        label = self.rng.choice(sliders)
+        _, widget, _ = self.widgets[label]
+        value = self.rng.uniform(widget.min, widget.max)
+        if widget.data_type == widget.INT:
+            value = round(value)
+        fragment_id = self._set(label, double_array_value=[value])
+        return await self.rerun(fragment_id=fragment_id if fragment else "")
+
+    async def answer_question(self):
+        choices = [label for label, (kind, _, _) in self.widgets.items() if kind == "selectbox" and label != SELECTOR]
+        label = self.rng.choice(choices)
+        _, widget, _ = self.widgets[label]
+        return await self.rerun(fragment_id=self._set(label, string_value=self.rng.choice(list(widget.options))))
+
+    async def predict(self):
+        _, widget, fragment_id = self.widgets[PREDICT_BUTTON]
+        return await self.rerun(triggers=[widget.id], fragment_id=fragment_id)
+
+
+async def run_session(url, seed, actions, think, latencies, start_gate):
+    rng = random.Random(seed)
+    session = Session(url, rng)
+    await start_gate.wait()
+    await asyncio.sleep(rng.uniform(0, think))
+    await session.connect()
+    latencies["page_load"].append(await session.rerun())
+
+    page = "Breast Cancer"
+    for _ in range(actions):
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+        roll = rng.random()
+        if roll < 0.15:
+            page = "Lung Cancer" if page == "Breast Cancer" else "Breast Cancer"
+            latencies["switch_page"].append(await session.select_page(page))
+        elif page == "Breast Cancer":
+            latencies["breast_slider"].append(await session.move_slider())
+        elif roll < 0.5:
+            latencies["lung_answer"].append(await session.answer_question())
+        else:
+            latencies["lung_predict"].append(await session.predict())
+    return session
+
+
+def summarise(samples):
+    values = np.array(samples) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+async def load_test(url, pid, sessions, actions, think, seed):
+    # Warm-up: one session opens both pages and makes a lung prediction, which
+    # draws tables, so imports and artifact loads are not billed to the first
+    # measured sessions.
+    warm = Session(url, random.Random(seed))
+    await warm.connect()
+    await warm.rerun()
+    await warm.select_page("Lung Cancer")
+    await warm.predict()
+    await warm.close()
+    await asyncio.sleep(1)
+    rss_warm = process_rss(pid)
+
+    latencies = defaultdict(list)
+    peak = [rss_warm]
+    gate = asyncio.Event()
+
+    async def sample_rss():
+        while True:
+            peak[0] = max(peak[0], process_rss(pid))
+            await asyncio.sleep(0.2)
+
+    sampler = asyncio.create_task(sample_rss())
+    tasks = [asyncio.create_task(run_session(url, seed + i + 1, actions, think, latencies, gate))
+             for i in range(sessions)]
+    start = time.perf_counter()
+    gate.set()
+    connected = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    # Every session is still connected here, holding its session state.
+    rss_connected = process_rss(pid)
+    sampler.cancel()
+    for session in connected:
+        await session.close()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "sessions": sessions,
+        "actions_per_session": actions,
+        "think_time_s": think,
+        "elapsed_s": elapsed,
+        "reruns": len(all_latencies),
+        "throughput_reruns_per_s": len(all_latencies) / elapsed,
+        "errors": warm.errors + sum(session.errors for session in connected),
+        "latency": {"all": summarise(all_latencies), **{name: summarise(v) for name, v in sorted(latencies.items())}},
+        "rss_warm_mib": rss_warm / 2 ** 20,
+        "rss_peak_mib": peak[0] / 2 ** 20,
+        "rss_connected_mib": rss_connected / 2 ** 20,
+        "per_session_mib": (rss_connected - rss_warm) / sessions / 2 ** 20,
+    }
+
+
+def report(result):
+    print(f"{result['sessions']} sessions x {result['actions_per_session']} actions in {result['elapsed_s']:.1f} s: "
+          f"{result['reruns']} reruns, {result['throughput_reruns_per_s']:.1f} reruns/s, {result['errors']} errors")
+    for name, row in result["latency"].items():
+        print(f"  {name:<14} n={row['count']:<5} p50 {row['p50_ms']:8.1f} ms   p95 {row['p95_ms']:8.1f} ms   "
+              f"p99 {row['p99_ms']:8.1f} ms")
+    print(f"  server RSS warm {result['rss_warm_mib']:.1f} MiB, peak {result['rss_peak_mib']:.1f} MiB, "
+          f"with sessions connected {result['rss_connected_mib']:.1f} MiB "
+          f"({result['per_session_mib']:.2f} MiB per session)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent sessions against a local Streamlit server")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[50])
+    parser.add_argument("--actions", type=int, default=20, help="interactions per session")
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between a session's interactions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="test an already running server instead of starting one (RSS is then "
+                                      "read from --pid)")
+    parser.add_argument("--pid", type=int)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for sessions in args.sessions:
+        # A fresh server per session count, so memory figures do not carry over.
+        server = None
+        if args.url:
+            url, pid = args.url, args.pid
+        else:
+            port = free_port()
+            server = start_server(port)
+            url, pid = f"ws://127.0.0.1:{port}/_stcore/stream", server.pid
+        try:
+            result = asyncio.run(load_test(url, pid, sessions, args.actions, args.think, args.seed))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        report(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # Exceptions rendered by the app make the latency figures meaningless.
+    errors = sum(result["errors"] for result in results)
+    if errors:
+        print(f"FAILED: the app rendered {errors} exceptions")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+# An artifact is a directory holding one .npy file per array and a
+# manifest.json describing them. Readers only ever look at the manifest, which
+# is written last, so a retrain swaps a whole artifact in one step.
+FORMAT = "cancer-predictor-artifact"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Array files whose checksum already matched in this process, keyed by path,
+# mtime, size and expected digest, so an evicted artifact that is read again
+# is not hashed again.
+_verified = set()
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _matches(file, sha256):
+    stat = os.stat(file)
+    key = (file, stat.st_mtime_ns, stat.st_size, sha256)
+    if key in _verified:
+        return True
+    if _sha256(file) != sha256:
+        return False
+    _verified.add(key)
+    return True
+
+
+def write_artifact(directory, kind, features, arrays, attributes=None, metadata=None):
+    # arrays: name -> ndarray; attributes: small JSON values the model needs
+    # (bias, class labels, ...); metadata: how and from what it was trained.
+    os.makedirs(directory, exist_ok=True)
+    entries = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        path = os.path.join(directory, f"{name}.npy")
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, array)
+        os.replace(tmp, path)
+        entries[name] = {
+            "file": f"{name}.npy",
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "sha256": _sha256(path),
+        }
+
+    manifest = {
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        "kind": kind,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "features": list(features),
+        "arrays": entries,
+        "attributes": attributes or {},
+        "metadata": metadata or {},
+    }
+    path = os.path.join(directory, MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def read_artifact(path, kind=None, verify=True):
+    # path is the artifact's manifest.json. Arrays are memory-mapped
+    # read-only, so processes share them through the page cache instead of
+    # each holding a copy. With verify, the first read of each file version
+    # in a process hashes it in full, which reads every page once. Loaders
+    # may still derive copies of their own, such as load_fused's stacked
+    # weights.
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a model artifact manifest")
+    if manifest["format_version"] > FORMAT_VERSION:
+        raise ValueError(f"{path} uses artifact format {manifest['format_version']}, "
+                         f"this version reads up to {FORMAT_VERSION}")
+    if kind is not None and manifest["kind"] != kind:
+        raise ValueError(f"{path} holds a {manifest['kind']} model, expected {kind}")
+
+    directory = os.path.dirname(path)
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        file = os.path.join(directory, entry["file"])
+        if verify and not _matches(file, entry["sha256"]):
+            raise ValueError(f"{file} does not match the checksum in {path}")
+        array = np.load(file, mmap_mode="r")
+        if array.dtype.str != entry["dtype"] or list(array.shape) != entry["shape"]:
+            raise ValueError(f"{file} does not match the dtype or shape in {path}")
+        # A plain ndarray view of the mapping, without the np.memmap
+        # subclass overhead on every indexing operation.
+        arrays[name] = np.asarray(array)
+
+    return {**manifest, "arrays": arrays}
+
+
+def estimator_metadata(estimator, **fields):
+    # Hyperparameters that survive a JSON round trip, plus anything the
+    # trainer wants to record (dataset checksum, metrics, library versions).
+    # Read from the instance rather than get_params(), which fails on
+    # estimators unpickled from older sklearn releases.
+    params = {
+        key: value for key, value in vars(estimator).items()
+        if not key.startswith("_") and not key.endswith("_")
+        and isinstance(value, (str, int, float, bool, type(None)))
+    }
+    return {"estimator": type(estimator).__name__, "params": params, **fields}
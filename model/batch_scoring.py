@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 50_000
+THRESHOLD = 0.5
+LABELS = np.array(["Benign", "Malignant"], dtype=object)
+
+
+def validate_columns(columns, features):
+    missing = [key for key in features if key not in columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+
+def score_chunk(chunk, predict, features, threshold=THRESHOLD):
+    X = chunk[features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    # Missing, non-numeric and infinite values all leave a record unscored,
+    # as the inference server rejects them.
+    valid = np.isfinite(X).all(axis=1)
+
+    proba = np.full((len(chunk), 2), np.nan)
+    if valid.any():
+        proba[valid] = predict(X[valid])
+
+    # Only records with a probability get a label.
+    scored = ~np.isnan(proba[:, 1])
+    prediction = np.full(len(chunk), "", dtype=object)
+    prediction[scored] = LABELS[(proba[scored, 1] > threshold).astype(int)]
+
+    keep = [c for c in chunk.columns if c not in features and not c.startswith("Unnamed")]
+    result = chunk[keep].copy()
+    result["prediction"] = prediction
+    result["probability_benign"] = proba[:, 0]
+    result["probability_malignant"] = proba[:, 1]
+    return result
+
+
+def score_csv(source, predict, features, chunksize=CHUNK_SIZE, threshold=THRESHOLD):
+    reader = pd.read_csv(source, chunksize=chunksize)
+    for i, chunk in enumerate(reader):
+        if i == 0:
+            validate_columns(chunk.columns, features)
+        yield score_chunk(chunk, predict, features, threshold)
+
+
+def write_scored_csv(source, destination, predict, features, chunksize=CHUNK_SIZE, threshold=THRESHOLD, progress=None):
+    total = source.seek(0, 2)
+    source.seek(0)
+
+    rows = 0
+    for i, result in enumerate(score_csv(source, predict, features, chunksize, threshold)):
+        result.to_csv(destination, header=i == 0, index=False)
+        rows += len(result)
+        if progress is not None and total:
+            progress(min(source.tell() / total, 1.0), rows)
+
+    return rows
@@ -0,0 +1,41 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.base import clone
+
+# Set once per worker process by the pool initializer, so the training data
+# is shipped to each worker once rather than with every resample.
+_DATA = None
+
+
+def bootstrap_samples(n_rows, n_models, seed=0):
+    # Drawn up front in the parent, so the ensemble does not depend on how
+    # resamples are spread over the workers.
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, n_rows, size=(n_models, n_rows))
+
+
+def _init_worker(X, y):
+    global _DATA
+    _DATA = (X, y)
+
+
+def _fit(task):
+    estimator, rows = task
+    X, y = _DATA
+    estimator.fit(X[rows], y[rows])
+    return estimator
+
+
+def fit_bootstrap(estimator, X, y, n_models, workers=None, seed=0):
+    # One clone of estimator per resample, fitted concurrently across a
+    # process pool; returns the fitted clones in resample order.
+    workers = workers or os.cpu_count()
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y)
+    tasks = [(clone(estimator), rows) for rows in bootstrap_samples(len(X), n_models, seed)]
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(X, y)) as pool:
+        return list(pool.map(_fit, tasks, chunksize=chunksize))
@@ -1,19 +1,48 @@
-import pandas as pd
+import argparse
+import json
+import time
+import numpy as np
+import sklearn
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score, classification_report
 import pickle as pickle
+from feature_stats import save_feature_stats
+from artifacts import estimator_metadata
+from fused_model import fold_ensemble, fold_scaler, save_fused, verify_ensemble, verify_fused
+from bootstrap import fit_bootstrap
+from cv_search import prepare_folds, evaluate_candidates
+from dataset_cache import load_dataset, load_frame
+from model_registry import load_pickle
 
+# (penalty, solver) pairs searched for the logistic regression.
+PENALTY_SOLVERS = [("l2", "lbfgs"), ("l2", "liblinear"), ("l1", "liblinear"), ("l2", "saga"), ("l1", "saga")]
+C_VALUES = np.logspace(-3, 2, 11)
+# Bootstrap refits of the chosen model behind the app's confidence interval.
+BOOTSTRAP_MODELS = 100
 
-def create_model(data):
+
+def make_logistic_regression(C=1.0, penalty="l2", solver="lbfgs"):
+    params = {"C": C, "solver": solver, "max_iter": 1000}
+    # sklearn 1.8 deprecated `penalty` in favour of `l1_ratio`.
+    if LogisticRegression().penalty == "deprecated":
+        params["l1_ratio"] = 1.0 if penalty == "l1" else 0.0
+    else:
+        params["penalty"] = penalty
+    return LogisticRegression(**params)
+
+
+def create_model(data, model=None):
     X = data.drop("diagnosis", axis=1)
     y = data["diagnosis"]
 
     scaler = StandardScaler()
     X = scaler.fit_transform(X)
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    model = LogisticRegression()
+    model = model if model is not None else LogisticRegression()
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_test)
@@ -24,20 +53,113 @@ def create_model(data):
 
 
 def get_clean_data():
-    data = pd.read_csv("../data/data.csv")
-    data = data.drop(["Unnamed: 32", "id"], axis=1)
-    data["diagnosis"] = data["diagnosis"].map({"M": 1, "B": 0})
+    return load_frame("breast")
+
+
+def holdout_rows(data):
+    # The rows create_model tests on, recorded in the artifact so the app's
+    # evaluation page only scores records the model was not fitted to.
+    return train_test_split(np.arange(len(data)), test_size=0.2, random_state=42)[1].tolist()
+
+
+def fit_ensemble(model, scaler, data, n_models, workers=None):
+    # Refits model's hyperparameters on resamples of create_model's training
+    # rows, standardised with the deployed scaler.
+    X = scaler.transform(data.drop("diagnosis", axis=1))
+    y = data["diagnosis"].to_numpy()
+    train = np.setdiff1d(np.arange(len(data)), holdout_rows(data))
+    return fit_bootstrap(model, X[train], y[train], n_models, workers)
+
+
+def export_fused(model, scaler, X, ensemble=(), **metadata):
+    fused = fold_scaler(model, scaler)
+    verify_fused(fused, model, scaler, X)
+    if ensemble:
+        fused.update(fold_ensemble(ensemble, scaler))
+        verify_ensemble(fused, ensemble, scaler, X)
+        metadata["bootstrap_models"] = len(ensemble)
+    save_fused(fused, "artifacts/breast_cancer", estimator_metadata(
+        model, sklearn_version=sklearn.__version__, dataset_checksum=load_dataset("breast")["checksum"], **metadata))
 
-    return data
+
+def search_candidates(other_estimators=False):
+    candidates = [
+        ("LogisticRegression", {"C": float(C), "penalty": penalty, "solver": solver},
+         make_logistic_regression(C, penalty, solver))
+        for penalty, solver in PENALTY_SOLVERS
+        for C in C_VALUES
+    ]
+    if other_estimators:
+        candidates += [("SVC", {"C": float(C)}, SVC(C=C)) for C in C_VALUES]
+        candidates += [
+            ("RandomForestClassifier", {"n_estimators": n, "max_depth": depth},
+             RandomForestClassifier(n_estimators=n, max_depth=depth, random_state=42))
+            for n in (100, 300)
+            for depth in (None, 8)
+        ]
+    return candidates
+
+
+def search_model(data, n_splits=5, workers=None, other_estimators=False):
+    X = data.drop("diagnosis", axis=1)
+    y = data["diagnosis"].to_numpy()
+
+    # Folds are split and standardised once and reused by every candidate.
+    start = time.perf_counter()
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+    folds = prepare_folds(X, y, splitter, scale=True)
+    results = evaluate_candidates(search_candidates(other_estimators), folds, y, workers)
+    search_seconds = time.perf_counter() - start
+    results.sort(key=lambda r: (r["accuracy_mean"], r["roc_auc"]), reverse=True)
+
+    # The app serves the winner through the folded linear scorer, so only a
+    # logistic regression can be exported; other estimators are reported.
+    best = next(r for r in results if r["name"] == "LogisticRegression")
+    print("Best model : ", best["name"], best["params"], "CV accuracy", round(best["accuracy_mean"], 4))
+
+    model, scaler = create_model(data, make_logistic_regression(**best["params"]))
+    report = {"n_splits": n_splits, "search_seconds": search_seconds, "best": best, "candidates": results}
+    return model, scaler, report
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the breast cancer model")
+    parser.add_argument("--search", action="store_true", help="cross-validated hyperparameter search")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument("--other-estimators", action="store_true", help="also evaluate SVC and random forests")
+    parser.add_argument("--from-pickles", action="store_true",
+                        help="export the existing breast_cancer_model.pkl and scaler instead of training")
+    parser.add_argument("--pickle", action="store_true",
+                        help="also write the sklearn estimators, which the benchmarks compare against")
+    parser.add_argument("--bootstrap", type=int, default=BOOTSTRAP_MODELS,
+                        help="bootstrap models for the prediction interval (0 to skip)")
+    args = parser.parse_args()
+
     data = get_clean_data()
-    model, scaler = create_model(data)
-    with open("breast_cancer_model.pkl", "wb") as f:
-        pickle.dump(model, f)
-    with open("breast_cancer_scaler.pkl", "wb") as f:
-        pickle.dump(scaler, f)
+    metadata = {}
+    if args.from_pickles:
+        model, scaler = load_pickle("breast_cancer_model.pkl"), load_pickle("breast_cancer_scaler.pkl")
+        metadata["source"] = "breast_cancer_model.pkl"
+    elif args.search:
+        model, scaler, report = search_model(data, args.folds, args.workers, args.other_estimators)
+        metadata["cv"] = {key: report["best"][key] for key in ("accuracy_mean", "accuracy_std", "roc_auc")}
+        with open("breast_cancer_search.json", "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        model, scaler = create_model(data)
+    if not args.from_pickles:
+        metadata["holdout_rows"] = holdout_rows(data)
+    if args.pickle and not args.from_pickles:
+        with open("breast_cancer_model.pkl", "wb") as f:
+            pickle.dump(model, f)
+        with open("breast_cancer_scaler.pkl", "wb") as f:
+            pickle.dump(scaler, f)
+    save_feature_stats(data.drop("diagnosis", axis=1), "breast_cancer_stats.json")
+    start = time.perf_counter()
+    ensemble = fit_ensemble(model, scaler, data, args.bootstrap, args.workers) if args.bootstrap else []
+    print(f"Fitted {len(ensemble)} bootstrap models in {time.perf_counter() - start:.2f} s")
+    export_fused(model, scaler, data.drop("diagnosis", axis=1), ensemble, **metadata)
 
 
 if __name__ == '__main__':
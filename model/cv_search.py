@@ -0,0 +1,84 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+# Set once per worker process by the pool initializer, so the fold matrices
+# are shipped to each worker once rather than with every task.
+_FOLDS = None
+
+
+def prepare_folds(X, y, splitter, scale=False):
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y)
+    folds = []
+    for train, test in splitter.split(X, y):
+        X_train, X_test = X[train], X[test]
+        if scale:
+            scaler = StandardScaler().fit(X_train)
+            X_train, X_test = scaler.transform(X_train), scaler.transform(X_test)
+        folds.append({"X_train": X_train, "y_train": y[train], "X_test": X_test, "y_test": y[test], "test": test})
+    return folds
+
+
+def _init_worker(folds):
+    global _FOLDS
+    _FOLDS = folds
+
+
+def _evaluate(task):
+    candidate, fold, estimator = task
+    data = _FOLDS[fold]
+
+    start = time.perf_counter()
+    estimator.fit(data["X_train"], data["y_train"])
+    fit_time = time.perf_counter() - start
+
+    y_pred = estimator.predict(data["X_test"])
+    if hasattr(estimator, "predict_proba"):
+        y_score = estimator.predict_proba(data["X_test"])[:, 1]
+    else:
+        y_score = estimator.decision_function(data["X_test"])
+    return candidate, fold, y_pred, y_score, fit_time
+
+
+def evaluate_candidates(candidates, folds, y, workers=None):
+    # candidates is a list of (name, params, estimator); every (candidate,
+    # fold) pair is fitted as an independent task across the process pool.
+    workers = workers or os.cpu_count()
+    y = np.asarray(y)
+    tasks = [(c, f, clone(estimator)) for c, (_, _, estimator) in enumerate(candidates) for f in range(len(folds))]
+
+    y_pred = np.empty((len(candidates), len(y)), dtype=y.dtype)
+    y_score = np.empty((len(candidates), len(y)))
+    fit_times = np.empty((len(candidates), len(folds)))
+    fold_accuracy = np.empty((len(candidates), len(folds)))
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(folds,)) as pool:
+        for c, f, pred, score, fit_time in pool.map(_evaluate, tasks, chunksize=chunksize):
+            test = folds[f]["test"]
+            y_pred[c, test] = pred
+            y_score[c, test] = score
+            fit_times[c, f] = fit_time
+            fold_accuracy[c, f] = np.mean(pred == folds[f]["y_test"])
+
+    # ROC AUC is computed on the pooled out-of-fold scores so that it is also
+    # defined for leave-one-out, where each test fold holds a single row.
+    positive = np.unique(y)[-1]
+    return [
+        {
+            "name": name,
+            "params": params,
+            "accuracy_mean": float(fold_accuracy[c].mean()),
+            "accuracy_std": float(fold_accuracy[c].std()),
+            "roc_auc": float(roc_auc_score(y == positive, y_score[c])),
+            "fit_time_total": float(fit_times[c].sum()),
+            "fit_times": fit_times[c].tolist(),
+        }
+        for c, (name, params, _) in enumerate(candidates)
+    ]
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# pandas is only imported where a frame is built: the app reads the cached
+# arrays and should not pay for importing it.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+
+BREAST_CSV = os.path.join(DATA_DIR, "data.csv")
+LUNG_CSV = os.path.join(DATA_DIR, "survey lung cancer.csv")
+
+
+def clean_breast(path):
+    import pandas as pd
+    data = pd.read_csv(path)
+    data = data.drop(["Unnamed: 32", "id"], axis=1)
+    data["diagnosis"] = data["diagnosis"].map({"M": 1, "B": 0})
+    return data, "diagnosis"
+
+
+def clean_lung(path):
+    import pandas as pd
+    data = pd.read_csv(path)
+    data.columns = data.columns.str.strip()
+    # Encoded exactly like the Lung Cancer page: Male 0 / Female 1 and the
+    # yes/no answers left as the survey's 2/1.
+    data["GENDER"] = data["GENDER"].map({"M": 0, "F": 1})
+    data["LUNG_CANCER"] = data["LUNG_CANCER"].map({"YES": 1, "NO": 0})
+    return data, "LUNG_CANCER"
+
+
+DATASETS = {
+    "breast": (BREAST_CSV, clean_breast),
+    "lung": (LUNG_CSV, clean_lung),
+}
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _replace(path, write):
+    # Sessions are threads of one process, so temporary names must be unique
+    # per call, not only per process.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write_json(path, payload):
+    _replace(path, lambda f: f.write(json.dumps(payload, indent=2).encode()))
+
+
+def _save_array(path, array):
+    _replace(path, lambda f: np.save(f, array))
+
+
+def build_cache(name, cache_dir=CACHE_DIR):
+    source, clean = DATASETS[name]
+    directory = os.path.join(cache_dir, name)
+    os.makedirs(directory, exist_ok=True)
+
+    data, target = clean(source)
+    features = [c for c in data.columns if c != target]
+    # Fortran order keeps every feature column contiguous on disk.
+    _save_array(os.path.join(directory, "X.npy"), np.asfortranarray(data[features].to_numpy(dtype=float)))
+    _save_array(os.path.join(directory, "y.npy"), data[target].to_numpy(dtype=np.int8))
+
+    stat = os.stat(source)
+    _write_json(os.path.join(directory, "manifest.json"), {
+        "source": os.path.relpath(source, ROOT_DIR),
+        "checksum": file_checksum(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "features": features,
+        "target": target,
+        "rows": len(data),
+    })
+
+
+def _is_fresh(manifest_path, source):
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    stat = os.stat(source)
+    if (manifest["mtime_ns"], manifest["size"]) == (stat.st_mtime_ns, stat.st_size):
+        return True
+    # The file was touched; only a changed checksum invalidates the cache.
+    if manifest["size"] != stat.st_size or manifest["checksum"] != file_checksum(source):
+        return False
+    manifest["mtime_ns"] = stat.st_mtime_ns
+    _write_json(manifest_path, manifest)
+    return True
+
+
+def load_dataset(name, cache_dir=CACHE_DIR):
+    source, _ = DATASETS[name]
+    directory = os.path.join(cache_dir, name)
+    manifest_path = os.path.join(directory, "manifest.json")
+    if not _is_fresh(manifest_path, source):
+        build_cache(name, cache_dir)
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return {
+        "X": np.load(os.path.join(directory, "X.npy"), mmap_mode="r"),
+        "y": np.load(os.path.join(directory, "y.npy"), mmap_mode="r"),
+        "features": manifest["features"],
+        "target": manifest["target"],
+        "checksum": manifest["checksum"],
+    }
+
+
+def load_frame(name, cache_dir=CACHE_DIR):
+    import pandas as pd
+    dataset = load_dataset(name, cache_dir)
+    data = pd.DataFrame(dataset["X"], columns=dataset["features"], copy=False)
+    data[dataset["target"]] = dataset["y"]
+    return data
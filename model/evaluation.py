@@ -0,0 +1,84 @@
+import numpy as np
+
+CALIBRATION_BINS = 10
+
+
+def threshold_curves(y, score):
+    # Confusion counts at every distinct score, from one sort: walking the
+    # scores from high to low, the positives and negatives seen so far are
+    # the true and false positives of every threshold down to the next lower
+    # score. Row 0 predicts nothing positive, the last row everything.
+    y = np.asarray(y).astype(bool)
+    score = np.asarray(score, dtype=float)
+    order = np.argsort(score, kind="mergesort")[::-1]
+    score, y = score[order], y[order]
+
+    last = np.r_[np.flatnonzero(np.diff(score)), len(score) - 1]
+    tp = np.r_[0, np.cumsum(y)[last]]
+    fp = np.r_[0, last + 1 - tp[1:]]
+    positives, negatives = int(tp[-1]), int(fp[-1])
+
+    predicted = tp + fp
+    return {
+        # Predicting positive for score > threshold gives row i's counts for
+        # every threshold from threshold[i] up to threshold[i - 1].
+        "threshold": np.r_[score[last], -np.inf],
+        "tp": tp,
+        "fp": fp,
+        "fn": positives - tp,
+        "tn": negatives - fp,
+        "tpr": tp / max(positives, 1),
+        "fpr": fp / max(negatives, 1),
+        "precision": np.divide(tp, predicted, out=np.ones(len(tp)), where=predicted > 0),
+        "accuracy": (tp + negatives - fp) / len(y),
+        "positives": positives,
+        "negatives": negatives,
+    }
+
+
+def area(x, y):
+    return float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2))
+
+
+def average_precision(curves):
+    return float(np.sum(np.diff(curves["tpr"]) * curves["precision"][1:]))
+
+
+def calibration_curve(y, score, bins=CALIBRATION_BINS):
+    # Mean predicted probability against the observed positive rate in equal
+    # width probability bins; empty bins are dropped.
+    y = np.asarray(y, dtype=float)
+    score = np.asarray(score, dtype=float)
+    bin_index = np.minimum((score * bins).astype(int), bins - 1)
+    count = np.bincount(bin_index, minlength=bins)
+    filled = count > 0
+    return {
+        "predicted": np.bincount(bin_index, weights=score, minlength=bins)[filled] / count[filled],
+        "observed": np.bincount(bin_index, weights=y, minlength=bins)[filled] / count[filled],
+        "count": count[filled],
+    }
+
+
+def evaluate(y, score, bins=CALIBRATION_BINS):
+    curves = threshold_curves(y, score)
+    return {
+        "curves": curves,
+        "calibration": calibration_curve(y, score, bins),
+        "roc_auc": area(curves["fpr"], curves["tpr"]),
+        "average_precision": average_precision(curves),
+        "brier": float(np.mean((np.asarray(score, dtype=float) - np.asarray(y, dtype=float)) ** 2)),
+        "rows": len(score),
+    }
+
+
+def operating_point(curves, threshold):
+    # Confusion counts when predicting positive for score > threshold: the
+    # first row whose threshold is at or below it.
+    i = np.searchsorted(-curves["threshold"], -threshold, side="left")
+    return {key: int(curves[key][i]) for key in ("tp", "fp", "fn", "tn")}
+
+
+def best_threshold(curves):
+    # Youden's J: the threshold furthest above the chance diagonal.
+    i = int(np.argmax(curves["tpr"] - curves["fpr"]))
+    return float(curves["threshold"][i])
@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+def compute_feature_stats(X):
+    return {
+        "features": list(X.columns),
+        "min": X.min().tolist(),
+        "max": X.max().tolist(),
+        "mean": X.mean().tolist(),
+        "std": X.std().tolist(),
+        "quantiles": {str(q): X.quantile(q).tolist() for q in QUANTILES},
+    }
+
+
+def save_feature_stats(X, path):
+    with open(path, "w") as f:
+        json.dump(compute_feature_stats(X), f, indent=2)
+
+
+def load_feature_stats(path):
+    with open(path) as f:
+        raw = json.load(f)
+
+    stats = {"features": raw["features"]}
+    for key in ("min", "max", "mean", "std"):
+        stats[key] = np.array(raw[key], dtype=float)
+    stats["quantiles"] = {q: np.array(v, dtype=float) for q, v in raw["quantiles"].items()}
+    stats["range"] = stats["max"] - stats["min"]
+    return stats
+
+
+def normalise(stats, values):
+    return (np.asarray(values, dtype=float) - stats["min"]) / stats["range"]
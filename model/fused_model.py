@@ -0,0 +1,98 @@
+import numpy as np
+
+from artifacts import read_artifact, write_artifact
+
+
+def fold_scaler(model, scaler):
+    # StandardScaler followed by a linear model is itself linear:
+    # w . (x - mean) / scale + b == (w / scale) . x + (b - (w / scale) . mean)
+    weights = model.coef_[0] / scaler.scale_
+    bias = model.intercept_[0] - weights @ scaler.mean_
+    # The scaler itself is kept for lookups in the scaled feature space.
+    return {
+        "features": list(scaler.feature_names_in_),
+        "weights": weights,
+        "bias": float(bias),
+        "mean": scaler.mean_,
+        "scale": scaler.scale_,
+    }
+
+
+def fold_ensemble(models, scaler):
+    # The same folding for every bootstrap member, one row per member.
+    coef = np.vstack([model.coef_[0] for model in models])
+    weights = coef / scaler.scale_
+    bias = np.array([model.intercept_[0] for model in models]) - weights @ scaler.mean_
+    return {"ensemble_weights": weights, "ensemble_bias": bias}
+
+
+def save_fused(fused, directory, metadata=None):
+    keys = ["weights", "mean", "scale"] + [key for key in ("ensemble_weights", "ensemble_bias") if key in fused]
+    arrays = {key: np.asarray(fused[key], dtype=float) for key in keys}
+    return write_artifact(directory, "logistic", fused["features"], arrays, {"bias": fused["bias"]}, metadata)
+
+
+def load_fused(path):
+    artifact = read_artifact(path, kind="logistic")
+    fused = {"features": artifact["features"], "bias": float(artifact["attributes"]["bias"]),
+             "metadata": artifact["metadata"], **artifact["arrays"]}
+    # The model and its bootstrap members as the columns of one matrix, so
+    # score_ensemble gets every member's log-odds from a single product.
+    members = fused.get("ensemble_weights", np.empty((0, len(fused["weights"]))))
+    fused["stacked_weights"] = np.column_stack([fused["weights"], members.T])
+    fused["stacked_bias"] = np.r_[fused["bias"], fused.get("ensemble_bias", [])]
+    return fused
+
+
+def score(fused, X):
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    z = X @ fused["weights"] + fused["bias"]
+    malignant = np.exp(-np.logaddexp(0, -z))
+    proba = np.column_stack([1 - malignant, malignant])
+    return (z > 0).astype(int), proba
+
+
+def contributions(fused, X):
+    # Exact per-feature log-odds: coef_i * (x_i - mean_i) / scale_i, i.e. the
+    # scaled value times its coefficient, is weights_i * (x_i - mean_i). They
+    # add up to the log-odds minus that of the training mean, which is
+    # returned alongside.
+    X = np.asarray(X, dtype=float)
+    return fused["weights"] * (X - fused["mean"]), float(fused["bias"] + fused["weights"] @ fused["mean"])
+
+
+def score_ensemble(fused, X, level=0.95):
+    # Class probabilities of the model, and the central `level` interval of
+    # the malignant probability across the bootstrap members; the interval
+    # is None for an artifact without an ensemble.
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    z = X @ fused["stacked_weights"] + fused["stacked_bias"]
+    malignant = np.exp(-np.logaddexp(0, -z))
+    proba = np.column_stack([1 - malignant[:, 0], malignant[:, 0]])
+    if malignant.shape[1] == 1:
+        return proba, None
+    # np.quantile's linear interpolation, spelled out: its per-call overhead
+    # costs more than the matrix product itself for a single row.
+    members = np.sort(malignant[:, 1:], axis=1)
+    position = np.array([(1 - level) / 2, (1 + level) / 2]) * (members.shape[1] - 1)
+    below = np.floor(position).astype(int)
+    above = np.minimum(below + 1, members.shape[1] - 1)
+    fraction = position - below
+    return proba, members[:, below] * (1 - fraction) + members[:, above] * fraction
+
+
+def verify_fused(fused, model, scaler, X, atol=1e-9):
+    classes, proba = score(fused, X)
+    X_scaled = scaler.transform(X)
+    if not np.array_equal(classes, model.predict(X_scaled)):
+        raise ValueError("Fused model predicts different classes from the sklearn pipeline")
+    if not np.allclose(proba, model.predict_proba(X_scaled), rtol=0, atol=atol):
+        raise ValueError("Fused model probabilities differ from the sklearn pipeline")
+
+
+def verify_ensemble(fused, models, scaler, X, atol=1e-9):
+    X_scaled = scaler.transform(X)
+    expected = np.column_stack([model.predict_proba(X_scaled)[:, 1] for model in models])
+    z = np.asarray(X, dtype=float) @ fused["ensemble_weights"].T + fused["ensemble_bias"]
+    if not np.allclose(np.exp(-np.logaddexp(0, -z)), expected, rtol=0, atol=atol):
+        raise ValueError("Fused ensemble probabilities differ from the bootstrap models")
@@ -0,0 +1,284 @@
+import argparse
+import bisect
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from predictors import LUNG_FEATURES, breast_features, predict_breast, predict_lung
+
+# Bucket upper bounds; the last bucket catches everything larger.
+LATENCY_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf")]
+BATCH_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, float("inf")]
+MODELS = ("breast", "lung")
+
+
+class Histogram:
+    # Bucket counts followed by the total count and sum, in one flat list. With
+    # `shared`, a multiprocessing.Array from shared_metrics, every worker
+    # process observes into the same memory, so any worker reports the whole
+    # service.
+
+    def __init__(self, buckets=LATENCY_BUCKETS, shared=None):
+        self.buckets = buckets
+        if shared is None:
+            self._values = [0.0] * (len(buckets) + 2)
+            self._lock = threading.Lock()
+        else:
+            self._values = shared
+            self._lock = shared.get_lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._values[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[-2] += 1
+            self._values[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            values = list(self._values)
+        return {
+            "buckets": {("+Inf" if b == float("inf") else str(b)): int(c) for b, c in zip(self.buckets, values)},
+            "count": int(values[-2]),
+            "sum": values[-1],
+        }
+
+
+def shared_metrics(workers):
+    # Created by the parent before the workers start: one histogram array per
+    # model and metric, and one readiness flag per worker.
+    def histogram(buckets):
+        return multiprocessing.Array("d", len(buckets) + 2)
+
+    return {
+        "latency": {name: histogram(LATENCY_BUCKETS) for name in MODELS},
+        "batch_rows": {name: histogram(BATCH_BUCKETS) for name in MODELS},
+        "ready": multiprocessing.Array("b", workers),
+    }
+
+
+class MicroBatcher:
+    # Requests that arrive within `window` seconds of the first queued one are
+    # stacked into a single matrix and scored with one model call.
+
+    def __init__(self, predict, window=0.005, max_batch_size=256, batch_sizes=None):
+        self.predict = predict
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batch_sizes = batch_sizes or Histogram(BATCH_BUCKETS)
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, X):
+        future = Future()
+        self._queue.put((X, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            rows = len(pending[0][0])
+            deadline = time.monotonic() + self.window
+            while rows < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                rows += len(item[0])
+
+            self.batch_sizes.observe(rows)
+            try:
+                proba = self.predict(np.vstack([X for X, _ in pending]))
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for X, future in pending:
+                future.set_result(proba[offset:offset + len(X)])
+                offset += len(X)
+
+
+def parse_instances(payload, features):
+    instances = payload.get("instances") if isinstance(payload, dict) else None
+    if not instances:
+        raise ValueError("Request body must be a JSON object with a non-empty 'instances' list")
+
+    rows = []
+    for instance in instances:
+        if isinstance(instance, dict):
+            missing = [key for key in features if key not in instance]
+            if missing:
+                raise ValueError(f"Missing features: {', '.join(missing)}")
+            instance = [instance[key] for key in features]
+        elif not isinstance(instance, list):
+            raise ValueError("Each instance must be a list of feature values or an object keyed by feature name")
+        if len(instance) != len(features):
+            raise ValueError(f"Expected {len(features)} features, got {len(instance)}")
+        rows.append(instance)
+
+    try:
+        X = np.array(rows, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("Feature values must be numeric")
+    if not np.isfinite(X).all():
+        raise ValueError("Feature values must be finite")
+    return X
+
+
+class InferenceService:
+    # With `shared` from shared_metrics, readiness and metrics cover every
+    # worker process of the service, not just the one answering; `worker` is
+    # this process's index into the readiness flags.
+
+    def __init__(self, window=0.005, max_batch_size=256, shared=None, worker=0):
+        shared = shared or shared_metrics(1)
+        batch_rows = {name: Histogram(BATCH_BUCKETS, shared["batch_rows"][name]) for name in MODELS}
+        self.models = {
+            "breast": {
+                "features": breast_features,
+                "labels": ["Benign", "Malignant"],
+                "batcher": MicroBatcher(predict_breast, window, max_batch_size, batch_rows["breast"]),
+            },
+            "lung": {
+                "features": lambda: LUNG_FEATURES,
+                "labels": ["No Lung Cancer", "Has Lung Cancer"],
+                "batcher": MicroBatcher(predict_lung, window, max_batch_size, batch_rows["lung"]),
+            },
+        }
+        self.latency = {name: Histogram(LATENCY_BUCKETS, shared["latency"][name]) for name in MODELS}
+        self._ready = shared["ready"]
+        self.worker = worker
+
+    def warm_up(self):
+        for spec in self.models.values():
+            spec["batcher"].submit(np.zeros((1, len(spec["features"]())))).result()
+        self._ready[self.worker] = 1
+
+    def readiness(self):
+        # The kernel hands a connection to any worker, so the service is only
+        # ready once every worker has warmed up.
+        ready = sum(self._ready[:])
+        return {"ready": ready == len(self._ready), "workers_ready": ready, "workers": len(self._ready)}
+
+    def predict(self, name, payload):
+        spec = self.models[name]
+        X = parse_instances(payload, spec["features"]())
+        proba = spec["batcher"].submit(X).result()
+        return {
+            "predictions": [
+                {"label": spec["labels"][int(p[1] > 0.5)], "probabilities": dict(zip(spec["labels"], p.tolist()))}
+                for p in proba
+            ]
+        }
+
+    def metrics(self):
+        return {
+            "answered_by_pid": os.getpid(),
+            **self.readiness(),
+            "latency_ms": {name: h.snapshot() for name, h in self.latency.items()},
+            "batch_rows": {name: spec["batcher"].batch_sizes.snapshot() for name, spec in self.models.items()},
+        }
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            readiness = self.service.readiness()
+            self._reply(200 if readiness["ready"] else 503, readiness)
+        elif self.path == "/metrics":
+            self._reply(200, self.service.metrics())
+        else:
+            self._reply(404, {"error": "Not found"})
+
+    def do_POST(self):
+        name = self.path.removeprefix("/predict/")
+        if not self.path.startswith("/predict/") or name not in self.service.models:
+            self._reply(404, {"error": "Not found"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+            self._reply(200, self.service.predict(name, payload))
+        except ValueError as e:
+            self._reply(400, {"error": str(e)})
+        except Exception:
+            traceback.print_exc()
+            self._reply(500, {"error": "Internal server error"})
+        finally:
+            self.service.latency[name].observe((time.perf_counter() - start) * 1000)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Every worker process binds the same port and the kernel spreads
+        # incoming connections across them.
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def serve(host, port, window, max_batch_size, shared=None, worker=0):
+    service = InferenceService(window, max_batch_size, shared, worker)
+    handler = type("Handler", (InferenceHandler,), {"service": service})
+    server = ReusePortHTTPServer((host, port), handler)
+    threading.Thread(target=service.warm_up, daemon=True).start()
+    print(f"Worker {os.getpid()} serving on http://{host}:{port}")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP inference service for the breast and lung models")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    serve_args = (args.host, args.port, args.batch_window_ms / 1000, args.max_batch_size)
+    if args.workers == 1:
+        serve(*serve_args)
+        return
+
+    shared = shared_metrics(args.workers)
+    workers = [multiprocessing.Process(target=serve, args=serve_args + (shared, i)) for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Rolling window of the most recent durations kept per span name.
+WINDOW = 1000
+
+logger = logging.getLogger("cancer_predictor.perf")
+if os.environ.get("PERF_LOG"):
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_lock = threading.Lock()
+
+
+def record(name, millis):
+    with _lock:
+        _samples[name].append(millis)
+
+
+@contextmanager
+def span(name, **fields):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        millis = (time.perf_counter() - start) * 1000
+        record(name, millis)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"ts": time.time(), "span": name, "ms": round(millis, 3), **fields}))
+
+
+def timed(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentiles():
+    with _lock:
+        snapshot = {name: np.array(values) for name, values in _samples.items() if values}
+
+    return {
+        name: {
+            "count": len(values),
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "p99_ms": float(np.percentile(values, 99)),
+            "max_ms": float(values.max()),
+        }
+        for name, values in sorted(snapshot.items())
+    }
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -1,6 +1,99 @@
+import argparse
+import json
+import time
 import numpy as np
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score
 from sklearn.model_selection import StratifiedKFold, LeaveOneOut
+from sklearn.tree import DecisionTreeClassifier
+import sklearn
+import pickle as pickle
+from artifacts import estimator_metadata
+from cv_search import prepare_folds, evaluate_candidates
+from dataset_cache import load_dataset, load_frame
+from tree_compiler import compile_tree, domain_samples, save_compiled, verify_compiled
 
+
+def get_clean_data():
+    data = load_frame("lung")
+    # The deployed tree was trained with string class labels.
+    data["LUNG_CANCER"] = np.where(data["LUNG_CANCER"] == 1, "1", "0")
+
+    return data
+
+
+def create_model(data, max_depth=None):
+    X = data.drop("LUNG_CANCER", axis=1).to_numpy(dtype=float)
+    y = data["LUNG_CANCER"].to_numpy()
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    model = DecisionTreeClassifier(max_depth=max_depth, random_state=42)
+    model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+    print("Accuracy of the model : ", accuracy_score(y_test, y_pred))
+    print("ROC AUC of the model : ", roc_auc_score(y_test == "1", model.predict_proba(X_test)[:, 1]))
+
+    return model
+
+
+def holdout_rows(data):
+    # create_model's stratified test split, as row numbers of the dataset.
+    rows = np.arange(len(data))
+    return train_test_split(rows, test_size=0.2, random_state=42, stratify=data["LUNG_CANCER"])[1].tolist()
+
+
+def evaluate_model(data, max_depth=None, n_splits=10, workers=None):
+    X = data.drop("LUNG_CANCER", axis=1).to_numpy(dtype=float)
+    y = data["LUNG_CANCER"].to_numpy()
+    candidates = [("DecisionTreeClassifier", {"max_depth": max_depth},
+                   DecisionTreeClassifier(max_depth=max_depth, random_state=42))]
+
+    report = {}
+    for name, splitter in (("stratified_kfold", StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)),
+                           ("leave_one_out", LeaveOneOut())):
+        # Each fold is fitted as its own task, so the 309 leave-one-out fits
+        # run concurrently across the process pool.
+        start = time.perf_counter()
+        folds = prepare_folds(X, y, splitter)
+        result = evaluate_candidates(candidates, folds, y, workers)[0]
+        result["n_folds"] = len(folds)
+        result["seconds"] = time.perf_counter() - start
+        print(f"{name} : accuracy {result['accuracy_mean']:.4f}, ROC AUC {result['roc_auc']:.4f}, "
+              f"{len(folds)} folds in {result['seconds']:.2f} s")
+        report[name] = result
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the lung cancer decision tree")
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument("--pickle", action="store_true",
+                        help="also write the sklearn estimator, which the benchmarks compare against")
+    args = parser.parse_args()
+
+    data = get_clean_data()
+    report = evaluate_model(data, args.max_depth, args.folds, args.workers)
+    model = create_model(data, args.max_depth)
+
+    compiled = compile_tree(model)
+    verify_compiled(compiled, model, np.vstack([data.drop("LUNG_CANCER", axis=1).to_numpy(dtype=float),
+                                                domain_samples(100_000)]))
+
+    if args.pickle:
+        with open("lung_decision_tree_model.pkl", "wb") as f:
+            pickle.dump(model, f)
+    dataset = load_dataset("lung")
+    save_compiled(compiled, "artifacts/lung_cancer", dataset["features"], estimator_metadata(
+        model, sklearn_version=sklearn.__version__, dataset_checksum=dataset["checksum"],
+        cv={key: report["stratified_kfold"][key] for key in ("accuracy_mean", "accuracy_std", "roc_auc")},
+        holdout_rows=holdout_rows(data)))
+    with open("lung_cancer_metrics.json", "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
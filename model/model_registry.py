@@ -0,0 +1,136 @@
+import os
+import pickle as pickle
+import threading
+import time
+
+import numpy as np
+
+
+def current_rss():
+    # Resident set size in bytes; 0 where /proc is unavailable.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def artifact_bytes(artifact, seen=None):
+    # Bytes held by the arrays reachable from an artifact. Memory-mapped
+    # arrays barely move the resident set when loaded, so an RSS delta
+    # under-reports them.
+    seen = set() if seen is None else seen
+    if id(artifact) in seen:
+        return 0
+    seen.add(id(artifact))
+    if isinstance(artifact, np.ndarray):
+        return artifact.nbytes
+    if isinstance(artifact, dict):
+        values = artifact.values()
+    elif isinstance(artifact, (list, tuple)):
+        values = artifact
+    elif hasattr(artifact, "__dict__"):
+        values = vars(artifact).values()
+    else:
+        return 0
+    return sum(artifact_bytes(value, seen) for value in values)
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ModelRegistry:
+    # One instance per process: Streamlit re-executes the app script on every
+    # rerun but imports this module only once, so every session shares it.
+
+    def __init__(self, loader=load_pickle):
+        self.loader = loader
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._reload_callbacks = []
+
+    def get(self, path, loader=None):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        # The signature and artifact are stored as one tuple and replaced
+        # together, so this lock-free check cannot see a signature whose
+        # artifact a concurrent discard has already dropped.
+        entry = self._entries.get(path)
+        current = None if entry is None else entry["current"]
+        if current is not None and current[0] == signature:
+            entry["hits"] += 1
+            return current[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            current = None if entry is None else entry["current"]
+            if current is not None and current[0] == signature:
+                entry["hits"] += 1
+                return current[1]
+
+            artifact, load_time, memory = self._load(path, loader or self.loader)
+            reloaded = entry is not None
+            if entry is None:
+                entry = {"hits": 0, "loads": 0}
+                self._entries[path] = entry
+            entry["current"] = (signature, artifact)
+            entry["load_time"] = load_time
+            entry["memory"] = memory
+            entry["loads"] += 1
+            entry["loaded_at"] = time.time()
+
+        if reloaded:
+            for callback in self._reload_callbacks:
+                callback(path)
+        return artifact
+
+    def on_reload(self, callback):
+        # callback(path) runs after an artifact changed on disk and was loaded
+        # again, so anything derived from the old version can be dropped.
+        self._reload_callbacks.append(callback)
+
+    def version(self, path):
+        entry = self._entries.get(os.path.abspath(path))
+        return 0 if entry is None else entry["loads"]
+
+    def _load(self, path, loader):
+        start = time.perf_counter()
+        artifact = loader(path)
+        load_time = time.perf_counter() - start
+        return artifact, load_time, artifact_bytes(artifact)
+
+    def stats(self):
+        return {
+            path: {
+                "load_time": entry["load_time"],
+                "loads": entry["loads"],
+                "hits": entry["hits"],
+                "memory": entry["memory"],
+                "loaded_at": entry["loaded_at"],
+                "loaded": entry["current"] is not None,
+            }
+            for path, entry in list(self._entries.items())
+        }
+
+    def discard(self, path):
+        # Drops the loaded artifact but keeps its counters, so the version
+        # still increases when it is loaded again.
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(path))
+            if entry is not None:
+                entry["current"] = None
+
+    def is_loaded(self, path):
+        entry = self._entries.get(os.path.abspath(path))
+        return entry is not None and entry["current"] is not None
+
+
+REGISTRY = ModelRegistry()
+
+
+def load_artifact(path, loader):
+    return REGISTRY.get(path, loader)
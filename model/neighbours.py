@@ -0,0 +1,16 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def build_case_index(X, y, mean, scale):
+    # The reference cases are standardised once with the model's scaler, so a
+    # query is a single k-d tree search in that space.
+    Z = (np.asarray(X, dtype=float) - mean) / scale
+    return {"tree": cKDTree(Z), "X": X, "y": np.asarray(y), "mean": mean, "scale": scale}
+
+
+def nearest_cases(index, x, k=5):
+    z = (np.asarray(x, dtype=float) - index["mean"]) / index["scale"]
+    distance, rows = index["tree"].query(z, k=min(k, len(index["y"])))
+    rows = np.atleast_1d(rows)
+    return rows, np.atleast_1d(distance), index["y"][rows]
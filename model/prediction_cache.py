@@ -0,0 +1,101 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def quantize(values, digits=5):
+    # Round to a number of significant digits so that near-identical inputs
+    # on very different feature scales (area ~1000, smoothness ~0.1) share
+    # an entry.
+    x = np.asarray(values, dtype=float)
+    magnitude = np.floor(np.log10(np.abs(x), out=np.zeros_like(x), where=x != 0))
+    scale = 10.0 ** (magnitude - (digits - 1))
+    return np.round(x / scale) * scale
+
+
+def value_size(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(value_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class PredictionCache:
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=3600, digits=5):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.digits = digits
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, model, version, values, compute):
+        x = quantize(values, self.digits)
+        key = (model, version, x.tobytes())
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+
+        # Computed on the quantized input so every value in a bucket gets the
+        # same answer regardless of which one filled the entry.
+        value = compute(x)
+        size = value_size(value) + len(key[2]) + 200
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, now + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self, model):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == model]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
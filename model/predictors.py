@@ -0,0 +1,250 @@
+import os
+
+import numpy as np
+
+from model_registry import REGISTRY, load_artifact
+from dataset_cache import BREAST_CSV, load_dataset
+from evaluation import evaluate
+from instrumentation import span
+from feature_stats import load_feature_stats, normalise
+from fused_model import contributions, load_fused, score, score_ensemble
+from tree_compiler import load_compiled, path_contributions, predict_proba_tree
+from prediction_cache import PredictionCache
+from sensitivity import sweep
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The pickled sklearn estimators are only read by the trainers and the
+# benchmarks; the app loads the artifacts under artifacts/.
+BREAST_MODEL_PATH = os.path.join(MODEL_DIR, "breast_cancer_model.pkl")
+BREAST_SCALER_PATH = os.path.join(MODEL_DIR, "breast_cancer_scaler.pkl")
+BREAST_STATS_PATH = os.path.join(MODEL_DIR, "breast_cancer_stats.json")
+BREAST_ARTIFACT_PATH = os.path.join(MODEL_DIR, "artifacts", "breast_cancer", "manifest.json")
+LUNG_MODEL_PATH = os.path.join(MODEL_DIR, "lung_decision_tree_model.pkl")
+LUNG_ARTIFACT_PATH = os.path.join(MODEL_DIR, "artifacts", "lung_cancer", "manifest.json")
+
+# Column order of the lung model, matching the inputs on the Lung Cancer page.
+LUNG_FEATURES = [
+    "gender", "age", "smoker", "yellow_fingers", "anxiety", "peer_pressure", "chronic_diseases", "fatigue",
+    "allergy", "wheezing", "alcohol", "cough", "shortness_of_breath", "swallowing_difficulty", "chest_pain",
+]
+
+# Points per feature in the breast what-if sweeps, and every value the Lung
+# Cancer page can submit for each of its inputs.
+SWEEP_POINTS = 25
+# Coverage of the bootstrap interval shown around breast predictions.
+INTERVAL_LEVEL = 0.95
+LUNG_GRIDS = [np.array([0.0, 1.0]), np.arange(0.0, 101.0)] + [np.array([1.0, 2.0])] * 13
+
+# Single-patient predictions shared by every session in the process, keyed on
+# the quantized inputs and the registry version of the artifacts behind them.
+PREDICTION_CACHE = PredictionCache()
+CACHE_ARTIFACTS = {
+    "breast": (BREAST_ARTIFACT_PATH, BREAST_STATS_PATH),
+    "breast_sensitivity": (BREAST_ARTIFACT_PATH, BREAST_STATS_PATH),
+    "lung": (LUNG_ARTIFACT_PATH,),
+    "lung_sensitivity": (LUNG_ARTIFACT_PATH,),
+    "breast_evaluation": (BREAST_ARTIFACT_PATH,),
+    "lung_evaluation": (LUNG_ARTIFACT_PATH,),
+}
+
+
+def _invalidate_cache(path):
+    for model, paths in CACHE_ARTIFACTS.items():
+        if path in paths:
+            PREDICTION_CACHE.invalidate(model)
+
+
+def _drop_case_index(path):
+    # The case index is standardised with the breast scaler.
+    if path == BREAST_ARTIFACT_PATH:
+        REGISTRY.discard(BREAST_CSV)
+
+
+REGISTRY.on_reload(_invalidate_cache)
+REGISTRY.on_reload(_drop_case_index)
+
+
+def evict_artifacts(paths):
+    # Frees loaded artifacts and every cached prediction derived from them;
+    # they are loaded again on next use.
+    for path in paths:
+        REGISTRY.discard(path)
+        _invalidate_cache(path)
+
+
+def _cache_version(model):
+    return tuple(REGISTRY.version(path) for path in CACHE_ARTIFACTS[model])
+
+
+def _read_only(value):
+    # Everything the registry and the prediction cache hand out is one object
+    # per process shared by every session and thread, so its arrays are made
+    # read-only rather than copied for each caller.
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _read_only(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _read_only(v)
+    return value
+
+
+def _load_breast_stats(path):
+    stats = load_feature_stats(path)
+    # The what-if sweep grid only depends on the observed ranges.
+    stats["sweep_grid"] = np.linspace(stats["min"], stats["max"], SWEEP_POINTS, axis=1)
+    return _read_only(stats)
+
+
+def get_breast_stats():
+    with span("data_load", artifact="breast_stats"):
+        return load_artifact(BREAST_STATS_PATH, _load_breast_stats)
+
+
+def breast_features():
+    return get_breast_stats()["features"]
+
+
+def _load_fused(path):
+    return _read_only(load_fused(path))
+
+
+def get_fused_model():
+    return load_artifact(BREAST_ARTIFACT_PATH, _load_fused)
+
+
+def predict_breast(X):
+    with span("model_load", model="breast"):
+        fused = get_fused_model()
+    with span("predict", model="breast"):
+        _, proba = score(fused, X)
+    return proba
+
+
+def predict_breast_interval(X, level=INTERVAL_LEVEL):
+    # predict_breast plus the bootstrap interval of the malignant
+    # probability, from the same single matrix product.
+    with span("model_load", model="breast"):
+        fused = get_fused_model()
+    with span("predict", model="breast"):
+        return score_ensemble(fused, X, level)
+
+
+def _case_index_loader(fused):
+    # Loaders run while the registry holds its lock, so the fused model is
+    # fetched by the caller and closed over rather than loaded from here.
+    def load(path):
+        # Imported here so that only processes serving the breast page load scipy.
+        from neighbours import build_case_index
+
+        dataset = load_dataset("breast")
+        if dataset["features"] != fused["features"]:
+            raise ValueError(f"{path} columns do not match the breast model features")
+        return _read_only(build_case_index(dataset["X"], dataset["y"], fused["mean"], fused["scale"]))
+
+    return load
+
+
+def get_case_index():
+    # Built once per process from the cached dataset and rebuilt when
+    # data.csv changes.
+    fused = get_fused_model()
+    with span("data_load", artifact="case_index"):
+        return load_artifact(BREAST_CSV, _case_index_loader(fused))
+
+
+def _load_lung_tree(path):
+    return _read_only(load_compiled(path))
+
+
+def get_lung_tree():
+    return load_artifact(LUNG_ARTIFACT_PATH, _load_lung_tree)
+
+
+def predict_lung(X):
+    with span("model_load", model="lung"):
+        compiled = get_lung_tree()
+    with span("predict", model="lung"):
+        return predict_proba_tree(compiled, X)
+
+
+def cached_breast_prediction(values):
+    # values in breast_features() order; returns the class probabilities, the
+    # bootstrap interval of the malignant probability (None without an
+    # ensemble), each feature's log-odds contribution and the min-max scaled
+    # inputs the radar chart is drawn from.
+    stats = get_breast_stats()
+    fused = get_fused_model()
+
+    def compute(x):
+        proba, interval = predict_breast_interval(x[None])
+        contribution, base = contributions(fused, x)
+        return _read_only({"proba": proba[0], "interval": None if interval is None else interval[0],
+                           "contributions": contribution, "base_log_odds": base, "scaled": normalise(stats, x)})
+
+    return PREDICTION_CACHE.get_or_compute("breast", _cache_version("breast"), values, compute)
+
+
+def cached_lung_prediction(values):
+    # Also returns the decision path behind the prediction and how each
+    # split on it changed the probability of lung cancer.
+    compiled = get_lung_tree()
+
+    def compute(x):
+        return _read_only({"proba": predict_lung(x[None])[0], "explanation": path_contributions(compiled, x)})
+
+    return PREDICTION_CACHE.get_or_compute("lung", _cache_version("lung"), values, compute)
+
+
+def breast_sensitivity(values):
+    # Malignancy probability as each feature moves across its observed range
+    # with the others held at values; grid and proba are (features, points).
+    stats = get_breast_stats()
+    fused = get_fused_model()
+    grid = stats["sweep_grid"]
+
+    def compute(x):
+        with span("sensitivity", model="breast"):
+            curves = sweep(lambda X: score(fused, X)[1], x, list(grid))
+        return _read_only({"grid": grid, "proba": np.vstack(curves)})
+
+    return PREDICTION_CACHE.get_or_compute("breast_sensitivity", _cache_version("breast"), values, compute)
+
+
+def lung_sensitivity(values):
+    compiled = get_lung_tree()
+
+    def compute(x):
+        with span("sensitivity", model="lung"):
+            curves = sweep(lambda X: predict_proba_tree(compiled, X), x, LUNG_GRIDS)
+        return _read_only({"grid": LUNG_GRIDS, "proba": curves})
+
+    return PREDICTION_CACHE.get_or_compute("lung_sensitivity", _cache_version("lung"), values, compute)
+
+
+def model_evaluation(model):
+    # ROC, precision-recall and calibration curves of "breast" or "lung" on
+    # the rows the trainer held out, or on every record when the artifact
+    # does not say which rows those were. Computed once per model version
+    # and dataset.
+    if model == "breast":
+        artifact, predict = get_fused_model(), predict_breast
+    else:
+        artifact, predict = get_lung_tree(), predict_lung
+    dataset = load_dataset(model)
+    if dataset["features"] != artifact["features"]:
+        raise ValueError(f"The {model} dataset columns do not match the model features")
+
+    def compute(_):
+        rows = artifact["metadata"].get("holdout_rows")
+        X, y = (dataset["X"], dataset["y"]) if rows is None else (dataset["X"][rows], dataset["y"][rows])
+        with span("evaluation", model=model):
+            result = evaluate(y, predict(X)[:, 1])
+        result["holdout"] = rows is not None
+        return _read_only(result)
+
+    version = _cache_version(f"{model}_evaluation") + (dataset["checksum"],)
+    return PREDICTION_CACHE.get_or_compute(f"{model}_evaluation", version, [], compute)
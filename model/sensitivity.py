@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def linear_grids(low, high, points):
+    return list(np.linspace(low, high, points, axis=1))
+
+
+def sweep_matrix(base, grids):
+    # One row per (feature, grid value): a copy of base with that single
+    # feature replaced, so every sweep is scored in one batched call.
+    base = np.asarray(base, dtype=float)
+    lengths = np.array([len(grid) for grid in grids])
+    feature = np.repeat(np.arange(len(grids)), lengths)
+
+    X = np.repeat(base[None, :], lengths.sum(), axis=0)
+    X[np.arange(len(X)), feature] = np.concatenate(grids)
+    return X, np.cumsum(lengths)[:-1]
+
+
+def sweep(predict, base, grids):
+    # predict maps an (n, features) matrix to (n, 2) class probabilities;
+    # returns the positive-class probability curve for each feature's grid.
+    X, splits = sweep_matrix(base, grids)
+    proba = predict(X)[:, 1]
+    return np.split(proba, splits)
@@ -0,0 +1,214 @@
+import argparse
+import os
+
+import numpy as np
+
+from artifacts import estimator_metadata, read_artifact, write_artifact
+from model_registry import load_pickle
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+# Rows are traversed in blocks of this many, so each step's temporaries stay
+# in cache rather than streaming through memory max_depth times.
+BLOCK_ROWS = 16384
+
+
+def compile_tree(clf):
+    tree = clf.tree_
+    value = tree.value[:, 0, :]
+    return {
+        "feature": tree.feature.astype(np.intp),
+        "threshold": tree.threshold.astype(float),
+        "left": tree.children_left.astype(np.intp),
+        "right": tree.children_right.astype(np.intp),
+        # Class probabilities for every node, not only leaves, so decision
+        # paths can be explained from the same arrays.
+        "value": value / value.sum(axis=1, keepdims=True),
+        "classes": [str(c) for c in clf.classes_],
+        "max_depth": int(tree.max_depth),
+    }
+
+
+TREE_ARRAYS = ("feature", "threshold", "left", "right", "value")
+
+
+def save_compiled(compiled, directory, features, metadata=None):
+    # Node indices are stored as int64 so the artifact reads the same on
+    # every platform.
+    arrays = {key: compiled[key] for key in TREE_ARRAYS}
+    for key in ("feature", "left", "right"):
+        arrays[key] = arrays[key].astype(np.int64)
+    attributes = {"classes": compiled["classes"], "max_depth": compiled["max_depth"]}
+    return write_artifact(directory, "decision_tree", features, arrays, attributes, metadata)
+
+
+def load_compiled(path):
+    artifact = read_artifact(path, kind="decision_tree")
+    compiled = dict(artifact["arrays"])
+    for key in ("feature", "left", "right"):
+        compiled[key] = compiled[key].astype(np.intp, copy=False)
+    compiled["features"] = artifact["features"]
+    compiled["classes"] = artifact["attributes"]["classes"]
+    compiled["max_depth"] = int(artifact["attributes"]["max_depth"])
+    compiled["metadata"] = artifact["metadata"]
+    compiled["traversal"] = traversal_arrays(compiled)
+    return compiled
+
+
+def traversal_arrays(compiled):
+    # Leaves point back at themselves, so rows that already finished can keep
+    # taking steps until enough of them have to be worth dropping.
+    leaf = compiled["left"] == -1
+    nodes = np.arange(len(leaf))
+    children = np.column_stack([np.where(leaf, nodes, compiled["right"]), np.where(leaf, nodes, compiled["left"])])
+    # For a float32 x, x <= t exactly when x <= the largest float32 not above
+    # t, so the comparisons need not widen every input to float64.
+    threshold = compiled["threshold"].astype(np.float32)
+    threshold = np.where(threshold > compiled["threshold"], np.nextafter(threshold, np.float32(-np.inf)), threshold)
+    return np.where(leaf, 0, compiled["feature"]), threshold, children.ravel(), leaf
+
+
+def apply_tree(compiled, X):
+    # sklearn compares float32 inputs against float64 thresholds; the float32
+    # thresholds from traversal_arrays keep the traversal bit-for-bit
+    # identical to the original tree.
+    X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+    if len(X) > BLOCK_ROWS:
+        return np.concatenate([apply_tree(compiled, X[i:i + BLOCK_ROWS]) for i in range(0, len(X), BLOCK_ROWS)])
+    feature, threshold, children, leaf = compiled.get("traversal") or traversal_arrays(compiled)
+
+    flat = X.ravel()
+    node = np.zeros(len(X), dtype=np.intp)
+    # The rows still descending, the node each is at and its offset in flat.
+    rows = np.arange(len(X))
+    current, offsets = node, rows * X.shape[1]
+    for _ in range(compiled["max_depth"]):
+        go_left = flat[offsets + feature[current]] <= threshold[current]
+        current = children[2 * current + go_left]
+        finished = leaf[current]
+        done = np.count_nonzero(finished)
+        if done == len(current):
+            break
+        # Compacting costs a pass of its own, so it waits until at least a
+        # quarter of the remaining rows have reached a leaf.
+        if done * 4 >= len(current):
+            node[rows] = current
+            keep = ~finished
+            rows, current, offsets = rows[keep], current[keep], offsets[keep]
+    node[rows] = current
+    return node
+
+
+def predict_proba_tree(compiled, X):
+    return np.take(compiled["value"], apply_tree(compiled, X), axis=0)
+
+
+def decision_path(compiled, x):
+    # The nodes from the root to x's leaf, with the same float32 comparisons
+    # as apply_tree.
+    x = np.asarray(x, dtype=np.float32).ravel()
+    feature, threshold, children, _ = compiled.get("traversal") or traversal_arrays(compiled)
+    left = compiled["left"]
+    node, path = 0, [0]
+    while left[node] != -1:
+        node = children[2 * node + (x[feature[node]] <= threshold[node])]
+        path.append(node)
+    return np.array(path)
+
+
+def path_contributions(compiled, x, cls=1):
+    # Every node stores its class probabilities, so the leaf's probability is
+    # exactly the root's plus the change made by each split on the path.
+    path = decision_path(compiled, x)
+    proba = compiled["value"][path, cls]
+    split = path[:-1]
+    change = np.diff(proba)
+    return {
+        "path": path,
+        "feature": compiled["feature"][split],
+        "threshold": compiled["threshold"][split],
+        "went_left": path[1:] == compiled["left"][split],
+        "proba": proba[1:],
+        "change": change,
+        "base": float(proba[0]),
+    }
+
+
+def predict_tree(compiled, X):
+    return np.array(compiled["classes"])[predict_proba_tree(compiled, X).argmax(axis=1)]
+
+
+def generate_python(compiled, name="predict_proba"):
+    feature, threshold = compiled["feature"], compiled["threshold"]
+    left, right, value = compiled["left"], compiled["right"], compiled["value"]
+    lines = [f"def {name}(x):"]
+
+    def emit(node, depth):
+        indent = "    " * depth
+        if left[node] == -1:
+            lines.append(f"{indent}return {tuple(value[node].tolist())!r}")
+            return
+        lines.append(f"{indent}if x[{int(feature[node])}] <= {float(threshold[node])!r}:")
+        emit(left[node], depth + 1)
+        lines.append(f"{indent}else:")
+        emit(right[node], depth + 1)
+
+    emit(0, 1)
+    return "\n".join(lines) + "\n"
+
+
+def load_generated(source, name="predict_proba"):
+    namespace = {}
+    exec(compile(source, "<generated tree>", "exec"), namespace)
+    return namespace[name]
+
+
+def domain_samples(n, seed=0):
+    # Inputs the Lung Cancer page can produce: gender 0/1, age 0-100 and the
+    # remaining 13 answers encoded as 1 (no) or 2 (yes).
+    rng = np.random.default_rng(seed)
+    X = rng.integers(1, 3, size=(n, 15)).astype(float)
+    X[:, 0] = rng.integers(0, 2, size=n)
+    X[:, 1] = rng.integers(0, 101, size=n)
+    return X
+
+
+def verify_compiled(compiled, clf, X, generated=None):
+    # Pickles from older sklearn releases store raw class counts per node,
+    # which newer releases return unnormalised from predict_proba.
+    expected = clf.predict_proba(X)
+    expected = expected / expected.sum(axis=1, keepdims=True)
+    if not np.array_equal(predict_proba_tree(compiled, X), expected):
+        raise ValueError("Compiled tree disagrees with the original DecisionTreeClassifier")
+    if not np.array_equal(predict_tree(compiled, X), clf.predict(X)):
+        raise ValueError("Compiled tree predicts different classes from the original DecisionTreeClassifier")
+    if generated is not None:
+        X32 = np.asarray(X, dtype=np.float32).tolist()
+        if not np.array_equal(np.array([generated(row) for row in X32]), expected):
+            raise ValueError("Generated Python tree disagrees with the original DecisionTreeClassifier")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a pickled lung decision tree into a model artifact")
+    parser.add_argument("--model", default=os.path.join(MODEL_DIR, "lung_decision_tree_model.pkl"))
+    parser.add_argument("--output", default=os.path.join(MODEL_DIR, "artifacts", "lung_cancer"))
+    parser.add_argument("--emit-python", help="also write the tree as generated if/else Python source")
+    args = parser.parse_args()
+
+    clf = load_pickle(args.model)
+    compiled = compile_tree(clf)
+    source = generate_python(compiled)
+
+    verify_compiled(compiled, clf, domain_samples(100_000), load_generated(source))
+    # Imported here so that loading a compiled tree does not pull in pandas.
+    from dataset_cache import load_dataset
+    dataset = load_dataset("lung")
+    save_compiled(compiled, args.output, dataset["features"],
+                  estimator_metadata(clf, source=os.path.basename(args.model), dataset_checksum=dataset["checksum"]))
+    if args.emit_python:
+        with open(args.emit_python, "w") as f:
+            f.write(source)
+    print(f"Compiled {len(compiled['feature'])} nodes to {args.output}")
+
+
+if __name__ == '__main__':
+    main()